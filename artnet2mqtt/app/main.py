@@ -8,33 +8,69 @@ ArtNet to MQTT for Home Assistant add-on.
 """
 import os
 import json
+import asyncio
+import signal
 import time
 import socket
 import logging
 import sys
-from collections import defaultdict
-from threading import Thread, Event
+from collections import defaultdict, deque
+from threading import Thread, Event, Lock
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import re
 import struct
+import select
+import mmap
+import multiprocessing
+import hashlib
+import base64
+import heapq
+from array import array
 import paho.mqtt.client as mqtt
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
 
 # ---------------------------------------------------------------------------
 # Pure-Python Art-Net (ArtDMX) listener — no native dependencies
 # ---------------------------------------------------------------------------
 ARTNET_PORT = 6454
+SACN_PORT = 5568
+_ALL_WORKERS = -1  # dispatcher key: forward to every worker (ArtSync)
+_WORKER_BACKOFF_S = (1.0, 60.0)  # restart delay of a crashed worker: first, cap (doubles per crash)
+_WORKER_STABLE_S = 60.0  # a worker that ran this long before dying restarts without back-off
+_MP = multiprocessing.get_context("spawn")  # workers never inherit threads or locks
+OPTIONS_PATH = "/data/options.json"
 _ARTNET_ID = b"Art-Net\x00"
 _OPCODE_DMX = 0x5000  # little-endian on the wire → 0x00 0x50
+_OPCODE_SYNC = 0x5200
+_OPCODE_POLL = 0x2000
+_OPCODE_POLL_REPLY = 0x2100
+DMX_CHANNELS = 512
+_DISCOVERY_VERIFY_S = 2.0  # time allowed for the broker to replay retained configs
+_DISCOVERY_RETRY_S = 0.5  # back-off after the MQTT client refused a config (QoS 1 queue full)
+_NONZERO = re.compile(rb"[^\x00]")
 
 
 class _ArtNetPacket:
-    """Minimal ArtDMX packet representation."""
+    """
+    Minimal ArtDMX packet representation.
+
+    The listener reuses a single instance; ``data`` is a memoryview into the
+    receive buffer and is only valid until the next ``readPacket`` call.
+    ``opcode`` is ``_OPCODE_SYNC`` for ArtSync, which carries no data.
+    """
 
-    __slots__ = ("universe", "data", "sequence", "physical")
+    __slots__ = ("opcode", "universe", "data", "sequence", "physical", "source", "received_at")
 
-    def __init__(self, universe: int, data: bytes, sequence: int = 0, physical: int = 0):
+    def __init__(self, universe: int = 0, data=b"", sequence: int = 0, physical: int = 0):
+        self.opcode = _OPCODE_DMX
         self.universe = universe
         self.data = data
         self.sequence = sequence
         self.physical = physical
+        self.source = ""  # sender IP address
+        self.received_at = 0.0  # time.monotonic() when the datagram was read
 
 
 class _ArtNetListener:
@@ -50,39 +86,1350 @@ class _ArtNetListener:
       14-15 : Universe (LE, 15-bit)
       16-17 : Length (BE)
       18+   : DMX data
+
+    The receive path does not allocate per packet: datagrams are read with
+    ``recvfrom_into`` into a preallocated buffer and exposed as memoryviews,
+    and the socket timeout is only changed when the caller asks for a new one.
     """
 
-    def __init__(self, host: str = "0.0.0.0", port: int = ARTNET_PORT):
-        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self._sock.bind((host, port))
+    _BUFFER_SIZE = 2048  # ArtDMX is at most 530 bytes; larger datagrams are truncated
 
-    def readPacket(self, timeout: float = 0.05) -> "_ArtNetPacket | None":
-        """Return next ArtDMX packet or None on timeout."""
+    def __init__(self, host: str = "0.0.0.0", port: int = ARTNET_PORT, timeout: float = 0.05, sock=None):
+        if sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((host, port))
+        self._sock = sock
         self._sock.settimeout(timeout)
+        self._timeout = timeout
+        self._buffer = bytearray(self._BUFFER_SIZE)
+        self._view = memoryview(self._buffer)
+        self._packet = _ArtNetPacket()
+        self.parse_failures = 0  # malformed / non Art-Net datagrams
+        self.ignored_opcodes = 0  # valid Art-Net packets other than ArtDMX
+        self.poll_replies = []  # prebuilt ArtPollReply datagrams (see _artpoll_replies)
+        self.polls_answered = 0
+        self.capture = None  # _CaptureWriter recording every ArtDMX frame (capture_file)
+
+    @property
+    def sock(self) -> socket.socket:
+        """Bound UDP socket (used by the asyncio engine)."""
+        return self._sock
+
+    def parse_datagram(self, data, addr=None) -> "_ArtNetPacket | None":
+        """Parse a datagram received elsewhere (e.g. by an asyncio transport)."""
+        packet = self._parse(memoryview(data), len(data), self._packet, addr)
+        if packet is not None:
+            packet.source = addr[0] if addr else ""
+            packet.received_at = time.monotonic()
+        return packet
+
+    def readPacket(self, timeout: "float | None" = None) -> "_ArtNetPacket | None":
+        """Return next ArtDMX packet or None on timeout (the packet object is reused)."""
+        if timeout is not None and timeout != self._timeout:
+            self._sock.settimeout(timeout)
+            self._timeout = timeout
         try:
-            raw, _ = self._sock.recvfrom(65535)
+            nbytes, addr = self._sock.recvfrom_into(self._buffer)
         except socket.timeout:
             return None
         except OSError:
             return None
-        return self._parse(raw)
+        packet = self._parse(self._view, nbytes, self._packet, addr)
+        if packet is not None:
+            packet.source = addr[0]
+            packet.received_at = time.monotonic()
+        return packet
+
+    def _parse(self, data, nbytes: int, packet: _ArtNetPacket, addr=None) -> "_ArtNetPacket | None":
+        if nbytes < 10 or data[:8] != _ARTNET_ID:
+            self.parse_failures += 1
+            return None
+        opcode = data[8] | (data[9] << 8)
+        if opcode != _OPCODE_DMX:
+            if opcode == _OPCODE_SYNC:
+                packet.opcode = _OPCODE_SYNC
+                packet.data = b""
+                packet.sequence = packet.physical = 0  # the packet is reused; no stale ArtDMX fields
+                if self.capture is not None:
+                    self.capture.append(packet, addr)
+                return packet
+            if opcode == _OPCODE_POLL and addr is not None and self.poll_replies:
+                self._answer_poll(addr)
+            else:
+                self.ignored_opcodes += 1
+            return None
+        if nbytes < 18:
+            self.parse_failures += 1
+            return None
+        length = (data[16] << 8) | data[17]
+        end = 18 + length
+        packet.opcode = _OPCODE_DMX
+        packet.sequence = data[12]
+        packet.physical = data[13]
+        packet.universe = (data[14] | (data[15] << 8)) & 0x7FFF
+        packet.data = data[18: end if end < nbytes else nbytes]
+        if self.capture is not None:
+            self.capture.append(packet, addr)
+        return packet
+
+    def peek_universe(self, data, nbytes: int, addr) -> "int | None":
+        """
+        Universe of an ArtDMX datagram without parsing it (worker dispatcher).
+
+        Returns ``_ALL_WORKERS`` for ArtSync, answers ArtPoll itself and
+        returns None for everything that no worker needs.
+        """
+        if nbytes < 16 or data[:8] != _ARTNET_ID:
+            self.parse_failures += 1
+            return None
+        opcode = data[8] | (data[9] << 8)
+        if opcode == _OPCODE_DMX:
+            return (data[14] | (data[15] << 8)) & 0x7FFF
+        if opcode == _OPCODE_SYNC:
+            return _ALL_WORKERS
+        if opcode == _OPCODE_POLL and self.poll_replies:
+            self._answer_poll(addr)
+        else:
+            self.ignored_opcodes += 1
+        return None
 
-    @staticmethod
-    def _parse(data: bytes) -> "_ArtNetPacket | None":
-        if len(data) < 18:
+    def _answer_poll(self, addr):
+        """Unicast the ArtPollReply pages to the controller that polled (Art-Net 4)."""
+        try:
+            for reply in self.poll_replies:
+                self._sock.sendto(reply, (addr[0], ARTNET_PORT))
+            self.polls_answered += 1
+        except OSError as e:
+            logger.debug("ArtPollReply to %s failed: %s", addr[0], e)
+
+    def close(self):
+        if self.capture is not None:
+            self.capture.close()
+            self.capture = None
+        try:
+            self._view.release()
+        except BufferError:
+            pass
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+# Warm-start state file: header, then per universe its number, seen mask and last published frame
+_STATE_MAGIC = b"A2MSTATE"
+_STATE_HEADER = struct.Struct("<8s8sI12x")  # magic, config fingerprint, universe count
+_STATE_RECORD = struct.Struct("<H2x")  # universe
+_STATE_RECORD_SIZE = _STATE_RECORD.size + 2 * DMX_CHANNELS
+
+
+class _StateFile:
+    """
+    Last published frame of each universe, kept in a memory-mapped file.
+
+    Routes keep their ``published`` and ``seen`` buffers as views into the
+    mapping, so every commit is persisted without an extra copy or syscall;
+    the kernel writes the pages back, also when the add-on is killed. The
+    fingerprint covers what changes the published topics; on a mismatch the
+    state is discarded and the bridge starts cold.
+    """
+
+    def __init__(self, path: str, fingerprint: bytes, universes):
+        self.path = path
+        self.restored = {}  # universe -> (seen, published) from the previous run
+        universes = sorted(universes)
+        size = _STATE_HEADER.size + len(universes) * _STATE_RECORD_SIZE
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            old = os.read(fd, max(os.fstat(fd).st_size, 0))
+            self._load(old, fingerprint)
+            os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._mmap[:] = bytes(size)
+        _STATE_HEADER.pack_into(self._mmap, 0, _STATE_MAGIC, fingerprint, len(universes))
+        self._offsets = {}
+        offset = _STATE_HEADER.size
+        for universe in universes:
+            _STATE_RECORD.pack_into(self._mmap, offset, universe)
+            start = offset + _STATE_RECORD.size
+            previous = self.restored.get(universe)
+            if previous is not None:
+                self._mmap[start:start + 2 * DMX_CHANNELS] = previous[0] + previous[1]
+            self._offsets[universe] = start
+            offset += _STATE_RECORD_SIZE
+
+    def _load(self, data: bytes, fingerprint: bytes):
+        if len(data) < _STATE_HEADER.size:
+            return
+        magic, stored, count = _STATE_HEADER.unpack_from(data, 0)
+        if magic != _STATE_MAGIC or stored != fingerprint:
+            return
+        offset = _STATE_HEADER.size
+        for _ in range(count):
+            if offset + _STATE_RECORD_SIZE > len(data):
+                break
+            (universe,) = _STATE_RECORD.unpack_from(data, offset)
+            start = offset + _STATE_RECORD.size
+            self.restored[universe] = (
+                data[start:start + DMX_CHANNELS],
+                data[start + DMX_CHANNELS:start + 2 * DMX_CHANNELS],
+            )
+            offset += _STATE_RECORD_SIZE
+
+    def attach(self, route: "_UniverseRoute"):
+        """Back ``route``'s change-detection buffers with this file."""
+        start = self._offsets[route.universe]
+        view = memoryview(self._mmap)
+        route.attach_state(view[start + DMX_CHANNELS:start + 2 * DMX_CHANNELS], view[start:start + DMX_CHANNELS])
+
+    def close(self):
+        """Write the mapping back to disk."""
+        try:
+            self._mmap.flush()
+        except (ValueError, OSError):
+            pass
+
+
+# Capture file: 32-byte header, then fixed-size records (record header + 512 DMX slots)
+_CAPTURE_MAGIC = b"A2MCAP01"
+_CAPTURE_HEADER = struct.Struct("<8sIIQd")  # magic, record size, reserved, record count, start (epoch s)
+_CAPTURE_RECORD = struct.Struct("<dHHBB4s")  # t (s since start), universe, length, sequence, physical, IPv4
+_CAPTURE_RECORD_SIZE = _CAPTURE_RECORD.size + DMX_CHANNELS
+_CAPTURE_COUNT_AT = 16  # offset of the record count in the header
+_CAPTURE_SYNC = 0xFFFF  # universe of ArtSync records (no data)
+
+
+class _CaptureWriter:
+    """
+    Append-only recording of ArtDMX (and ArtSync) packets into a memory-mapped file.
+
+    Every frame takes one fixed-size record, so appending is two
+    ``pack_into``/slice copies into the mapping and no syscall; the file is
+    extended (and remapped) ``_GROW`` records at a time. The record count in
+    the header is updated after each record, so a capture cut short by a crash
+    stays readable. Recording stops once ``max_bytes`` is reached. ``close``
+    may run on another thread than ``append`` (shutdown); a lock keeps them
+    apart and frames appended after ``close`` are ignored.
+    """
+
+    _GROW = 4096  # records per file extension (~2 MB)
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.count = 0
+        self.dropped = 0  # frames not recorded because the size limit was reached
+        self._limit = max(1, (max_bytes - _CAPTURE_HEADER.size) // _CAPTURE_RECORD_SIZE)
+        self._capacity = 0
+        self._mmap = None
+        self._ip = None
+        self._ip_bytes = bytes(4)
+        self._lock = Lock()
+        self._file = open(path, "w+b")
+        self._grow()
+        _CAPTURE_HEADER.pack_into(self._mmap, 0, _CAPTURE_MAGIC, _CAPTURE_RECORD_SIZE, 0, 0, time.time())
+        self._t0 = time.monotonic()
+
+    def _grow(self) -> bool:
+        capacity = min(self._capacity + self._GROW, self._limit)
+        if capacity == self._capacity:
+            return False
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.truncate(_CAPTURE_HEADER.size + capacity * _CAPTURE_RECORD_SIZE)
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._capacity = capacity
+        return True
+
+    def append(self, packet: _ArtNetPacket, addr=None):
+        with self._lock:
+            if self._mmap is None:
+                return  # closed
+            if self.count == self._capacity and not self._grow():
+                self.dropped += 1
+                return
+            if addr is not None and addr[0] != self._ip:
+                self._ip = addr[0]
+                self._ip_bytes = socket.inet_aton(addr[0])
+            if packet.opcode == _OPCODE_SYNC:
+                # ArtSync has no universe, sequence, physical port or data
+                universe, sequence, physical, data = _CAPTURE_SYNC, 0, 0, b""
+            else:
+                universe, sequence, physical, data = packet.universe, packet.sequence, packet.physical, packet.data
+            length = min(len(data), DMX_CHANNELS)
+            offset = _CAPTURE_HEADER.size + self.count * _CAPTURE_RECORD_SIZE
+            _CAPTURE_RECORD.pack_into(
+                self._mmap, offset, time.monotonic() - self._t0,
+                universe, length, sequence, physical, self._ip_bytes,
+            )
+            offset += _CAPTURE_RECORD.size
+            self._mmap[offset:offset + length] = data[:length]
+            self.count += 1
+            struct.pack_into("<Q", self._mmap, _CAPTURE_COUNT_AT, self.count)
+
+    def close(self):
+        """Flush and trim the file to the records actually written."""
+        with self._lock:
+            if self._mmap is None:
+                return
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+            self._file.truncate(_CAPTURE_HEADER.size + self.count * _CAPTURE_RECORD_SIZE)
+            self._file.close()
+
+
+class _CaptureReader:
+    """
+    Read-only view of a capture file written by ``_CaptureWriter``.
+
+    Iterating yields ``(t, universe, sequence, physical, source, data)`` with
+    ``t`` in seconds since the capture started and ``data`` a memoryview into
+    the mapping (valid until ``close``). ArtSync records have the universe
+    ``_CAPTURE_SYNC`` and no data.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _CAPTURE_HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"{path}: not an Art-Net2MQTT capture")
+        magic, record_size, _, count, self.started_at = _CAPTURE_HEADER.unpack_from(self._mmap, 0)
+        if magic != _CAPTURE_MAGIC or record_size != _CAPTURE_RECORD_SIZE:
+            self._mmap.close()
+            raise ValueError(f"{path}: not an Art-Net2MQTT capture (or unsupported version)")
+        stored = (len(self._mmap) - _CAPTURE_HEADER.size) // _CAPTURE_RECORD_SIZE
+        self.count = min(count, stored)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        view = memoryview(self._mmap)
+        unpack = _CAPTURE_RECORD.unpack_from
+        offset = _CAPTURE_HEADER.size
+        for _ in range(self.count):
+            t, universe, length, sequence, physical, ip = unpack(view, offset)
+            start = offset + _CAPTURE_RECORD.size
+            yield t, universe, sequence, physical, socket.inet_ntoa(ip), view[start:start + length]
+            offset += _CAPTURE_RECORD_SIZE
+
+    @property
+    def duration(self) -> float:
+        if not self.count:
+            return 0.0
+        offset = _CAPTURE_HEADER.size + (self.count - 1) * _CAPTURE_RECORD_SIZE
+        return _CAPTURE_RECORD.unpack_from(self._mmap, offset)[0]
+
+    def close(self):
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # a yielded memoryview is still alive; the mapping goes with it
+
+
+# DMX channel layout of each fixture profile, in patch order
+_FIXTURE_PROFILES = {
+    "dimmer": ("dimmer",),
+    "dimmer16": ("dimmer", "dimmer_fine"),
+    "rgb": ("red", "green", "blue"),
+    "rgbw": ("red", "green", "blue", "white"),
+    "rgb_dimmer16": ("dimmer", "dimmer_fine", "red", "green", "blue"),
+    "rgbw_dimmer16": ("dimmer", "dimmer_fine", "red", "green", "blue", "white"),
+    "pantilt": ("pan", "tilt"),
+    "pantilt16": ("pan", "pan_fine", "tilt", "tilt_fine"),
+}
+_FIXTURE_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+class _Fixture:
+    """
+    A group of DMX channels decoded into one combined state.
+
+    Colour and dimmer profiles become a Home Assistant JSON-schema ``light``
+    (16-bit dimmers use ``brightness_scale: 65535``); pan/tilt profiles become
+    a sensor whose attributes carry both axes.
+    """
+
+    __slots__ = ("name", "universe", "start_channel", "profile", "roles", "offset", "topic", "restore")
+
+    def __init__(self, name: str, universe: int, start_channel: int, profile: str):
+        self.name = name
+        self.universe = universe
+        self.start_channel = start_channel
+        self.profile = profile
+        self.roles = _FIXTURE_PROFILES[profile]
+        self.offset = start_channel - 1
+        self.topic = ""
+        self.restore = None  # channel bytes before the last OFF command (output)
+
+    @property
+    def offsets(self) -> range:
+        return range(self.offset, self.offset + len(self.roles))
+
+    @property
+    def component(self) -> str:
+        return "sensor" if "pan" in self.roles else "light"
+
+    @property
+    def color_mode(self) -> str:
+        if "white" in self.roles:
+            return "rgbw"
+        return "rgb" if "red" in self.roles else "brightness"
+
+    @property
+    def brightness_scale(self) -> int:
+        return 65535 if "dimmer_fine" in self.roles else 255
+
+    def decode(self, raw) -> dict:
+        """Combine the fixture's raw channel bytes into its state payload."""
+        v = dict(zip(self.roles, raw))
+        if "pan" in v:
+            if "pan_fine" in v:
+                return {"pan": v["pan"] << 8 | v["pan_fine"], "tilt": v["tilt"] << 8 | v["tilt_fine"]}
+            return {"pan": v["pan"], "tilt": v["tilt"]}
+
+        color_mode = self.color_mode
+        if color_mode == "brightness":
+            color = None
+        elif color_mode == "rgbw":
+            color = {"r": v["red"], "g": v["green"], "b": v["blue"], "w": v["white"]}
+        else:
+            color = {"r": v["red"], "g": v["green"], "b": v["blue"]}
+        if "dimmer" in v:
+            brightness = v["dimmer"] << 8 | v["dimmer_fine"] if "dimmer_fine" in v else v["dimmer"]
+        else:
+            brightness = max(color.values())  # no dimmer channel: brightest emitter
+        state = {"state": "ON" if brightness else "OFF", "brightness": brightness, "color_mode": color_mode}
+        if color is not None:
+            state["color"] = color
+        return state
+
+    def encode(self, command: dict, raw) -> bytes:
+        """
+        Apply a JSON-schema light command to the fixture's raw channel bytes.
+
+        OFF zeroes the dimmer (or the emitters when there is none) and keeps
+        the previous bytes, so a bare ON brings the fixture back as it was.
+        Without a dimmer channel, ``brightness`` scales the colour.
+        """
+        v = dict(zip(self.roles, raw))
+        emitters = [role for role in ("red", "green", "blue", "white") if role in v]
+        level_roles = ("dimmer",) if "dimmer" in v else emitters
+        if str(command.get("state", "ON")).upper() == "OFF":
+            if any(v[role] for role in level_roles):
+                self.restore = bytes(raw)
+            for role in level_roles:
+                v[role] = 0
+            if "dimmer_fine" in v:
+                v["dimmer_fine"] = 0
+            return bytes(v[role] for role in self.roles)
+
+        if not any(v[role] for role in level_roles) and "brightness" not in command:
+            # Bare ON after OFF: previous look, or full
+            if self.restore is not None:
+                v.update(zip(self.roles, self.restore))
+            else:
+                for role in level_roles:
+                    v[role] = 255
+                if "dimmer_fine" in v:
+                    v["dimmer_fine"] = 255
+        color = command.get("color") or {}
+        for key, role in (("r", "red"), ("g", "green"), ("b", "blue"), ("w", "white")):
+            if role in v and key in color:
+                v[role] = max(0, min(255, int(color[key])))
+        if "brightness" in command:
+            level = max(0, min(self.brightness_scale, int(command["brightness"])))
+            if "dimmer" in v:
+                if "dimmer_fine" in v:
+                    v["dimmer"], v["dimmer_fine"] = level >> 8, level & 0xFF
+                else:
+                    v["dimmer"] = level
+            else:
+                peak = max(v[role] for role in emitters)
+                for role in emitters:
+                    v[role] = v[role] * level // peak if peak else level
+        return bytes(v[role] for role in self.roles)
+
+
+class _ForwardedArtNetListener(_ArtNetListener):
+    """
+    Art-Net listener for a worker process, reading datagrams forwarded by the
+    supervisor over a socketpair. Each datagram is prefixed with the 4-byte
+    IPv4 address of the original sender.
+    """
+
+    def parse_datagram(self, data, addr=None) -> "_ArtNetPacket | None":
+        view = memoryview(data)
+        packet = self._parse(view[4:], len(data) - 4, self._packet)
+        if packet is not None:
+            packet.source = socket.inet_ntoa(data[:4])
+            packet.received_at = time.monotonic()
+        return packet
+
+    def readPacket(self, timeout: "float | None" = None) -> "_ArtNetPacket | None":
+        if timeout is not None and timeout != self._timeout:
+            self._sock.settimeout(timeout)
+            self._timeout = timeout
+        try:
+            nbytes = self._sock.recv_into(self._buffer)
+        except (socket.timeout, OSError):
             return None
-        if data[:8] != _ARTNET_ID:
+        packet = self._parse(self._view[4:], nbytes - 4, self._packet)
+        if packet is not None:
+            packet.source = socket.inet_ntoa(self._buffer[:4])
+            packet.received_at = time.monotonic()
+        return packet
+
+
+class _SacnListener:
+    """
+    E1.31 (sACN) receiver joining one multicast group per routed universe.
+
+    Only the groups 239.255.{hi}.{lo} of configured universes are joined, so
+    the kernel and NIC drop everything else. Data packets are parsed into the
+    same ``_ArtNetPacket`` the Art-Net listener produces and feed the same
+    dispatcher, with the source CID as ``source``. Per universe the
+    highest-priority live source wins; sources expire after ``source_timeout``
+    seconds or when they send Stream_Terminated.
+
+    E1.31 data packet layout (fields BE):
+      0-15    : root layer (preamble, postamble, "ASC-E1.17")
+      18-21   : root vector (0x00000004 = data)
+      22-37   : CID (source identifier)
+      40-43   : framing vector (0x00000002)
+      108     : priority (0-200)
+      111     : sequence
+      112     : options (bit 7 preview, bit 6 stream terminated)
+      113-114 : universe (1-63999)
+      123-124 : property value count (start code + slots)
+      125     : START code (0 = DMX)
+      126+    : DMX data
+    """
+
+    _ACN_ID = b"\x00\x10\x00\x00ASC-E1.17\x00\x00\x00"
+    _BUFFER_SIZE = 1144  # largest E1.31 datagram is 638 bytes
+
+    def __init__(self, universes, host: str = "0.0.0.0", port: int = SACN_PORT,
+                 timeout: float = 0.05, source_timeout: float = 2.5, sock=None):
+        joined = sock is not None  # a worker's forwarded socket joins nothing
+        if sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((host, port))
+        self._sock = sock
+        self._sock.settimeout(timeout)
+        self._timeout = timeout
+        self._buffer = bytearray(self._BUFFER_SIZE)
+        self._view = memoryview(self._buffer)
+        self._packet = _ArtNetPacket()
+        self.source_timeout = source_timeout
+        self._sources = {}  # universe -> {cid: (priority, last_seen)}
+        self.joined = []
+        self.parse_failures = 0
+        self.ignored = 0  # preview, non-DMX START code and non-data packets
+        self.lower_priority = 0  # frames dropped because a higher-priority source is live
+        for universe in universes:
+            if joined:
+                break
+            if not (1 <= universe <= 63999):
+                logger.warning("sACN universe %s is out of range 1-63999; not joining", universe)
+                continue
+            group = f"239.255.{universe >> 8}.{universe & 0xFF}"
+            mreq = socket.inet_aton(group) + socket.inet_aton("0.0.0.0")
+            try:
+                self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+                self.joined.append(universe)
+            except OSError as e:
+                logger.warning("Could not join sACN multicast group %s: %s", group, e)
+
+    @property
+    def sock(self) -> socket.socket:
+        """Bound UDP socket (used by the asyncio engine)."""
+        return self._sock
+
+    def parse_datagram(self, data, addr=None) -> "_ArtNetPacket | None":
+        """Parse a datagram received elsewhere (e.g. by an asyncio transport)."""
+        now = time.monotonic()
+        packet = self._parse(memoryview(data), len(data), self._packet, now)
+        if packet is not None:
+            packet.received_at = now
+        return packet
+
+    def readPacket(self, timeout: "float | None" = None) -> "_ArtNetPacket | None":
+        """Return the next accepted sACN frame or None (the packet object is reused)."""
+        if timeout is not None and timeout != self._timeout:
+            self._sock.settimeout(timeout)
+            self._timeout = timeout
+        try:
+            nbytes, _ = self._sock.recvfrom_into(self._buffer)
+        except (socket.timeout, BlockingIOError):
             return None
-        opcode = struct.unpack_from("<H", data, 8)[0]
-        if opcode != _OPCODE_DMX:
+        except OSError:
+            return None
+        now = time.monotonic()
+        packet = self._parse(self._view, nbytes, self._packet, now)
+        if packet is not None:
+            packet.received_at = now
+        return packet
+
+    def _parse(self, data, nbytes: int, packet: _ArtNetPacket, now: float) -> "_ArtNetPacket | None":
+        if nbytes < 126 or data[:16] != self._ACN_ID:
+            self.parse_failures += 1
+            return None
+        if data[21] != 0x04 or data[43] != 0x02 or data[125] != 0:
+            self.ignored += 1  # universe discovery, sync or a non-DMX START code
+            return None
+        options = data[112]
+        universe = (data[113] << 8) | data[114]
+        cid = bytes(data[22:38])
+        if options & 0x40:
+            # Stream_Terminated: the source leaves immediately
+            self._sources.get(universe, {}).pop(cid, None)
+            return None
+        if options & 0x80:
+            self.ignored += 1  # preview data is not for live output
+            return None
+        if not self._select(universe, cid, data[108], now):
+            self.lower_priority += 1
+            return None
+        count = ((data[123] << 8) | data[124]) - 1
+        end = 126 + count
+        packet.opcode = _OPCODE_DMX
+        packet.sequence = data[111]
+        packet.physical = 0
+        packet.source = cid.hex()  # sACN sources are identified by CID, not by IP
+        packet.universe = universe
+        packet.data = data[126: end if end < nbytes else nbytes]
+        return packet
+
+    def peek_universe(self, data, nbytes: int, addr) -> "int | None":
+        """Universe of an E1.31 data packet without parsing it (worker dispatcher)."""
+        if nbytes < 126 or data[:16] != self._ACN_ID:
+            self.parse_failures += 1
+            return None
+        if data[21] != 0x04 or data[43] != 0x02:
+            self.ignored += 1
+            return None
+        return (data[113] << 8) | data[114]
+
+    def _select(self, universe: int, cid: bytes, priority: int, now: float) -> bool:
+        """Record the source and tell whether it has the highest live priority."""
+        sources = self._sources.get(universe)
+        if sources is None:
+            sources = self._sources[universe] = {}
+        sources[cid] = (priority, now)
+        if len(sources) == 1:
+            return True
+        expired = now - self.source_timeout
+        best = 0
+        for other, (other_priority, seen) in list(sources.items()):
+            if seen < expired:
+                del sources[other]
+            elif other_priority > best:
+                best = other_priority
+        return priority >= best
+
+    def close(self):
+        try:
+            self._view.release()
+        except BufferError:
+            pass
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def _artpoll_replies(ip: str, universes, short_name: str, long_name: str) -> list:
+    """
+    Build the ArtPollReply datagrams advertising ``universes`` as output ports.
+
+    One reply carries at most four ports sharing Net and Sub-Net, so the
+    Port-Addresses are grouped by their upper 11 bits and each page gets its
+    own BindIndex (1, 2, ...). Controllers that honour the replies unicast
+    only these universes to the bridge instead of broadcasting everything.
+
+    Layout (239 bytes, multi-byte fields LE unless noted):
+      0 ID, 8 OpCode 0x2100, 10 IP, 14 Port, 16 VersInfo (BE), 18 NetSwitch,
+      19 SubSwitch, 20 Oem (BE), 23 Status1, 24 EstaMan, 26 ShortName[18],
+      44 LongName[64], 108 NodeReport[64], 172 NumPorts (BE), 174 PortTypes[4],
+      182 GoodOutputA[4], 190 SwOut[4], 200 Style, 207 BindIp, 211 BindIndex,
+      212 Status2
+    """
+    ip_bytes = socket.inet_aton(ip)
+    groups = defaultdict(list)
+    for address in sorted(universes):
+        groups[address >> 4].append(address & 0x0F)
+
+    replies = []
+    for base, subs in sorted(groups.items()):
+        for n in range(0, len(subs), 4):
+            ports = subs[n:n + 4]
+            reply = bytearray(239)
+            reply[0:8] = _ARTNET_ID
+            struct.pack_into("<H", reply, 8, _OPCODE_POLL_REPLY)
+            reply[10:14] = ip_bytes
+            struct.pack_into("<H", reply, 14, ARTNET_PORT)
+            reply[18] = (base >> 4) & 0x7F  # Net
+            reply[19] = base & 0x0F  # Sub-Net
+            struct.pack_into(">H", reply, 20, 0x00FF)  # OemUnknown
+            reply[23] = 0xD0  # indicators normal, Port-Address set locally
+            struct.pack_into("<H", reply, 24, 0x7FF0)  # ESTA prototype/experimental
+            reply[26:43] = short_name.encode("ascii", "replace")[:17].ljust(17, b"\x00")
+            reply[44:107] = long_name.encode("ascii", "replace")[:63].ljust(63, b"\x00")
+            reply[108:171] = b"#0001 [0000] OK".ljust(63, b"\x00")
+            struct.pack_into(">H", reply, 172, len(ports))
+            for k, sub in enumerate(ports):
+                reply[174 + k] = 0x80  # output port (Art-Net -> DMX512)
+                reply[182 + k] = 0x80  # data is being output
+                reply[190 + k] = sub
+            reply[200] = 0x00  # StNode
+            reply[207:211] = ip_bytes
+            reply[211] = len(replies) + 1  # BindIndex
+            reply[212] = 0x08  # supports 15-bit Port-Address
+            replies.append(bytes(reply))
+    return replies
+
+
+class _UniverseRoute:
+    """
+    Routing entry and change-detection state for one Art-Net Port-Address.
+
+    A universe may carry several channel ranges; ``channels`` is the merged,
+    sorted tuple of 1-based DMX channels published as sensors. Fixture
+    channels are watched too (``fixture_at`` maps their offsets) and feed the
+    same change detection and throttling.
+
+    Ranges may carry signal filters (``deadband``, ``hysteresis``,
+    ``smoothing``); ``filter`` runs them over the changed offsets only.
+
+    Change detection works on whole frames: the last published values live in
+    a 512-byte buffer mirrored as a big integer, so a frame is diffed with one
+    XOR/AND and the changed byte offsets are located by a C-level regex scan.
+    An idle frame never enters a Python-level per-channel loop.
+    """
+
+    __slots__ = (
+        "universe", "ranges", "channels", "topics", "frame_topic", "snapshot_topic", "snapshot", "snapshot_dirty",
+        "mask", "published", "published_int", "unseen", "seen", "last_pub_ms",
+        "latest", "scheduled", "fixtures", "fixture_at", "watched",
+        "filters", "smoothing", "deadband", "hysteresis", "alpha", "ema", "direction",
+        "raw", "changed_ms",
+    )
+
+    def __init__(self, universe: int):
+        self.universe = universe
+        self.ranges = []
+        self.channels = ()
+        self.topics = {}
+        self.frame_topic = ""
+        self.snapshot_topic = ""
+        self.snapshot = None  # raw 512-byte frame for the retained snapshot topic (snapshot_interval_s)
+        self.snapshot_dirty = False
+        self.mask = 0
+        self.published = bytearray(DMX_CHANNELS)
+        self.published_int = 0
+        self.unseen = 0  # channels never published yet (always "changed")
+        self.seen = bytearray(DMX_CHANNELS)  # 0xFF where a value was ever published (warm start)
+        self.last_pub_ms = array("d", bytes(8 * DMX_CHANNELS))
+        self.latest = bytearray(DMX_CHANNELS)  # newest frame while throttled channels are pending
+        self.scheduled = set()  # offsets with a pending trailing-edge flush
+        self.fixtures = []
+        self.fixture_at = {}  # dmx offset -> _Fixture
+        self.watched = 0  # channels covered by the mask
+        self.filters = False
+        self.smoothing = False
+
+    def add_range(self, start_channel: int, count: int, deadband: int = 0, hysteresis: int = 0, smoothing: float = 0.0):
+        """Add ``count`` channels starting at ``start_channel`` (1-based), optionally filtered."""
+        self.ranges.append((start_channel, count))
+        merged = set(self.channels)
+        merged.update(range(start_channel, start_channel + count))
+        self.channels = tuple(sorted(merged))
+        self._rebuild_mask()
+        if deadband or hysteresis or smoothing:
+            self._set_filters(range(start_channel - 1, start_channel - 1 + count), deadband, hysteresis, smoothing)
+
+    def _set_filters(self, offsets, deadband: int, hysteresis: int, smoothing: float):
+        if not self.filters:
+            self.filters = True
+            self.deadband = bytearray(DMX_CHANNELS)
+            self.hysteresis = bytearray(DMX_CHANNELS)
+            self.alpha = array("d", bytes(8 * DMX_CHANNELS))
+            self.ema = array("d", bytes(8 * DMX_CHANNELS))
+            self.direction = array("b", bytes(DMX_CHANNELS))
+            self.raw = bytearray(DMX_CHANNELS)  # last raw value seen per changed channel
+            self.changed_ms = array("d", bytes(8 * DMX_CHANNELS))  # when that raw value arrived
+        # smoothing is the weight of the previous value: 0 = off, 0.9 = heavy
+        alpha = 1.0 - smoothing if smoothing else 0.0
+        for i in offsets:
+            self.deadband[i] = deadband
+            self.hysteresis[i] = hysteresis
+            self.alpha[i] = alpha
+        self.smoothing = self.smoothing or bool(smoothing)
+
+    def add_fixture(self, fixture: _Fixture):
+        """Watch the channels of ``fixture``."""
+        self.fixtures.append(fixture)
+        for i in fixture.offsets:
+            self.fixture_at[i] = fixture
+        self._rebuild_mask()
+
+    def _rebuild_mask(self):
+        offsets = {ch - 1 for ch in self.channels}
+        offsets.update(self.fixture_at)
+        self.mask = 0
+        for i in offsets:
+            self.mask |= 0xFF << (8 * i)
+        self.watched = len(offsets)
+        self.unseen = self.mask
+
+    def bind_topics(self, node_name: str):
+        """Precompute per-channel and per-frame state topics, indexed by DMX offset."""
+        base = f"{node_name}/u/{self.universe}"
+        self.topics = {ch - 1: f"{base}/ch/{ch}" for ch in self.channels}
+        self.frame_topic = f"{base}/frame"
+        self.snapshot_topic = f"{base}/snapshot"
+        for fixture in self.fixtures:
+            fixture.topic = f"{node_name}/fx/{fixture.name}"
+
+    def update_snapshot(self, data):
+        """Copy the raw frame into the snapshot buffer; marks it dirty when it differs."""
+        n = min(len(data), DMX_CHANNELS)
+        if self.snapshot[:n] != data[:n]:
+            self.snapshot[:n] = data[:n]
+            self.snapshot_dirty = True
+
+    def describe(self) -> str:
+        return ", ".join(f"{start}-{start + count - 1}" for start, count in self.ranges)
+
+    def diff(self, data, change_only: bool = True) -> list:
+        """Return DMX offsets of monitored channels that differ from the last published frame."""
+        length = len(data)
+        mask = self.mask
+        if length < DMX_CHANNELS:
+            mask &= (1 << (8 * length)) - 1
+        else:
+            data = data[:DMX_CHANNELS]
+        if change_only:
+            mask &= (int.from_bytes(data, "little") ^ self.published_int) | self.unseen
+        if not mask:
+            return []
+        return [m.start() for m in _NONZERO.finditer(mask.to_bytes(DMX_CHANNELS, "little"))]
+
+    def filter(self, offsets, data, now_ms: float):
+        """
+        Run the signal filters over changed ``offsets``; returns ``(accepted, held, values)``.
+
+        ``values`` is ``data`` with smoothed values written over it (a copy is
+        only made when the route smooths). Held channels differ from the last
+        published value but not by enough; the caller settles them on their
+        exact raw value once it stopped moving.
+        """
+        published = self.published
+        deadband = self.deadband
+        hysteresis = self.hysteresis
+        alpha = self.alpha
+        ema = self.ema
+        direction = self.direction
+        raw = self.raw
+        changed_ms = self.changed_ms
+        unseen = self.unseen
+        values = bytearray(data[:DMX_CHANNELS]) if self.smoothing else data
+        accepted = []
+        held = []
+        for i in offsets:
+            r = data[i]
+            if raw[i] != r:
+                raw[i] = r
+                changed_ms[i] = now_ms
+            if unseen and (unseen >> (8 * i)) & 0xFF:
+                ema[i] = r  # first value is published as is
+                accepted.append(i)
+                continue
+            v = r
+            a = alpha[i]
+            if a:
+                e = ema[i] + a * (r - ema[i])
+                if -0.5 < r - e < 0.5:
+                    e = r  # snap: the smoothed value always lands on the final one
+                ema[i] = e
+                v = values[i] = int(e + 0.5)
+            delta = v - published[i]
+            if -deadband[i] <= delta <= deadband[i]:
+                held.append(i)
+                continue
+            h = hysteresis[i]
+            if h and direction[i] and (delta > 0) != (direction[i] > 0) and -h <= delta <= h:
+                held.append(i)  # small reversal: jitter
+                continue
+            direction[i] = 1 if delta > 0 else -1
+            accepted.append(i)
+        return accepted, held, values
+
+    def commit(self, offsets, data, now_ms: float):
+        """Record ``data`` at ``offsets`` as published at ``now_ms``."""
+        published = self.published
+        last_pub_ms = self.last_pub_ms
+        unseen = self.unseen
+        seen = self.seen
+        for i in offsets:
+            published[i] = data[i]
+            last_pub_ms[i] = now_ms
+            if unseen:
+                unseen &= ~(0xFF << (8 * i))
+                seen[i] = 0xFF
+        self.unseen = unseen
+        self.published_int = int.from_bytes(published, "little")
+
+    def attach_state(self, published, seen):
+        """
+        Keep ``published``/``seen`` in the given buffers (views into the warm-start
+        file) and resume change detection from their contents.
+        """
+        seen[:] = (int.from_bytes(seen, "little") & self.mask).to_bytes(DMX_CHANNELS, "little")
+        self.published = published
+        self.seen = seen
+        self.published_int = int.from_bytes(published, "little")
+        self.unseen = self.mask & ~int.from_bytes(seen, "little")
+
+
+class _SequenceTracker:
+    """
+    Per-(source IP, universe) ArtDMX sequence tracking.
+
+    Sequence numbers run 1..255 and wrap; 0 means the sender does not use
+    them. A frame whose sequence is equal to (duplicate) or up to 127 steps
+    behind (out of order) the last accepted one is stale. After
+    ``resync_after`` stale frames in a row the sender is assumed to have
+    restarted and its new sequence is accepted.
+    """
+
+    def __init__(self, resync_after: int = 8):
+        self.resync_after = resync_after
+        self.rejected = 0
+        self._last = {}  # (source, universe) -> [last sequence, stale run]
+
+    def accept(self, source: str, universe: int, sequence: int) -> bool:
+        if not sequence:
+            return True
+        key = (source, universe)
+        state = self._last.get(key)
+        if state is None:
+            self._last[key] = [sequence, 0]
+            return True
+        if ((sequence - state[0]) & 0xFF) >= 128 or sequence == state[0]:
+            state[1] += 1
+            if state[1] < self.resync_after:
+                self.rejected += 1
+                return False
+        state[0] = sequence
+        state[1] = 0
+        return True
+
+
+class _HtpMerger:
+    """
+    Highest-Takes-Precedence merge of several sources feeding one universe.
+
+    Each source's latest frame is kept; sources silent for ``timeout_s``
+    (10 s, as in the Art-Net spec) leave the merge. With a single active
+    source its frame is passed through unchanged.
+    """
+
+    def __init__(self, timeout_s: float = 10.0):
+        self.timeout_s = timeout_s
+        self._sources = {}  # source -> [bytearray, length, last_seen]
+
+    def merge(self, source: str, data, now: float):
+        state = self._sources.get(source)
+        if state is None:
+            state = self._sources[source] = [bytearray(DMX_CHANNELS), 0, now]
+        length = min(len(data), DMX_CHANNELS)
+        if length < state[1]:
+            state[0][length:state[1]] = bytes(state[1] - length)
+        state[0][:length] = data[:length]
+        state[1] = length
+        state[2] = now
+        if len(self._sources) == 1:
+            return data
+
+        expired = [src for src, st in self._sources.items() if now - st[2] > self.timeout_s]
+        for src in expired:
+            del self._sources[src]
+        if len(self._sources) == 1:
+            return data
+        length = max(st[1] for st in self._sources.values())
+        return bytes(map(max, *(st[0] for st in self._sources.values())))[:length]
+
+
+class _ArtSyncBuffer:
+    """
+    ArtSync (Art-Net 4) frame buffer.
+
+    Once an ArtSync arrives the bridge is in synchronous mode: routed ArtDMX
+    frames are held per universe (the newest frame wins) and released together
+    on the next ArtSync, so a cue spanning several universes is published as one
+    consistent snapshot. Without ArtSync for ``timeout_s`` (4 s per the spec)
+    the bridge falls back to processing frames immediately.
+    """
+
+    def __init__(self, timeout_s: float = 4.0):
+        self.timeout_s = timeout_s
+        self.active_until = 0.0  # 0 = immediate mode
+        self.received = 0
+        self.coalesced = 0  # held frames replaced by a newer one before the sync
+        self._pending = {}  # universe -> _ArtNetPacket (owned copy)
+
+    def hold(self, packet: _ArtNetPacket):
+        """Keep a copy of ``packet`` until the next ArtSync."""
+        frame = self._pending.get(packet.universe)
+        if frame is None:
+            frame = self._pending[packet.universe] = _ArtNetPacket(packet.universe)
+        else:
+            self.coalesced += 1
+        frame.data = bytes(packet.data)
+        frame.sequence = packet.sequence
+        frame.physical = packet.physical
+        frame.source = packet.source
+        frame.received_at = packet.received_at
+
+    def sync(self, now: float) -> list:
+        """Enter (or stay in) synchronous mode; returns the held frames to publish."""
+        self.received += 1
+        self.active_until = now + self.timeout_s
+        return self._take()
+
+    def expire(self) -> list:
+        """Leave synchronous mode; returns the frames still held."""
+        self.active_until = 0.0
+        return self._take()
+
+    def _take(self) -> list:
+        frames = list(self._pending.values())
+        self._pending = {}
+        return frames
+
+
+class _TimerWheel:
+    """
+    Hashed timer wheel for trailing-edge throttle deadlines.
+
+    ``schedule`` is O(1) and ``advance`` only visits the slots of ticks that
+    elapsed since the previous call, so thousands of pending channels cost
+    nothing until they expire. Deadlines further away than one rotation stay
+    in their slot until their tick comes round.
+    """
+
+    def __init__(self, tick_ms: float = 5.0, slots: int = 256):
+        self.tick_ms = tick_ms
+        self.size = 0
+        self._slots = [[] for _ in range(slots)]
+        self._tick = 0  # last processed tick
+
+    def schedule(self, item, deadline_ms: float, now_ms: float):
+        """Fire ``item`` on the first ``advance`` at or after ``deadline_ms``."""
+        if not self.size:
+            self._tick = int(now_ms // self.tick_ms)
+        tick = max(int(-(-deadline_ms // self.tick_ms)), self._tick + 1)
+        self._slots[tick % len(self._slots)].append((tick, item))
+        self.size += 1
+
+    def advance(self, now_ms: float) -> list:
+        """Return the items whose deadline has passed."""
+        now_tick = int(now_ms // self.tick_ms)
+        if not self.size:
+            self._tick = now_tick
+            return []
+        slots = self._slots
+        start = max(self._tick + 1, now_tick - len(slots) + 1)
+        expired = []
+        for tick in range(start, now_tick + 1):
+            slot = slots[tick % len(slots)]
+            if not slot:
+                continue
+            keep = [entry for entry in slot if entry[0] > now_tick]
+            if len(keep) != len(slot):
+                expired.extend(item for due, item in slot if due <= now_tick)
+                slot[:] = keep
+        self._tick = now_tick
+        self.size -= len(expired)
+        return expired
+
+
+class _DiscoveryCache:
+    """
+    Content-hash cache of the retained MQTT Discovery configs.
+
+    ``desired`` holds the configs this bridge wants retained, ``known`` the
+    digest of what the broker is known to hold (``None`` = nothing). Only
+    topics whose digests differ are queued, and the queue is drained through
+    a token bucket (``rate`` messages/s, 0 = unpaced) so a reconnect or a Home
+    Assistant restart never bursts hundreds of retained QoS 1 messages ahead of
+    DMX traffic. ``begin_verify``/``finish_verify`` learn ``known`` from the
+    retained messages the broker replays on subscribe.
+    """
+
+    def __init__(self, rate: float = 0):
+        self.rate = rate
+        self.burst = max(1.0, rate)
+        self.tokens = self.burst
+        self.desired = {}  # topic -> (payload, digest)
+        self.known = {}  # topic -> digest | None
+        self.watching = set()
+        self.verify_deadline = None
+        self.published = 0
+        self.skipped = 0
+        self._queue = deque()
+        self._queued = set()
+        self._stamp = time.monotonic()
+        self._lock = Lock()
+
+    @staticmethod
+    def digest(payload) -> "bytes | None":
+        if not payload:
             return None
-        sequence = data[12]
-        physical = data[13]
-        universe = struct.unpack_from("<H", data, 14)[0]
-        length = struct.unpack_from(">H", data, 16)[0]
-        dmx_data = data[18: 18 + length]
-        return _ArtNetPacket(universe, dmx_data, sequence, physical)
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=8).digest()
+
+    def set_desired(self, configs):
+        """Replace the desired configs with ``(topic, payload)`` pairs."""
+        desired = {topic: (payload, self.digest(payload)) for topic, payload in configs}
+        with self._lock:
+            self.desired = desired
+
+    def begin_verify(self, topics, deadline: float):
+        """Forget what the broker holds for ``topics`` until ``deadline``; retained replays refill it."""
+        with self._lock:
+            self.watching = set(topics)
+            for topic in self.watching:
+                self.known[topic] = None
+            self.verify_deadline = deadline
+
+    def observe(self, topic: str, payload: bytes) -> bool:
+        """Record a retained config seen on the broker; False if ``topic`` is not watched."""
+        with self._lock:
+            if topic not in self.watching:
+                return False
+            self.known[topic] = self.digest(payload)
+            return True
+
+    def finish_verify(self) -> list:
+        """End verification, queue differences and stale configs; returns the watched topics."""
+        with self._lock:
+            topics = list(self.watching)
+            for topic in topics:
+                if topic not in self.desired and self.known.get(topic) is not None:
+                    self._enqueue(topic)  # left over from another mode / removed entity
+            self.watching = set()
+            self.verify_deadline = None
+        self.enqueue_changes()
+        return topics
+
+    def enqueue_changes(self) -> int:
+        """Queue every desired config the broker does not hold yet; returns the queue length."""
+        with self._lock:
+            for topic, (_, digest) in self.desired.items():
+                if self.known.get(topic) != digest:
+                    self._enqueue(topic)
+                elif topic not in self._queued:
+                    self.skipped += 1
+            return len(self._queue)
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def _enqueue(self, topic: str):
+        if topic not in self._queued:
+            self._queued.add(topic)
+            self._queue.append(topic)
+
+    def take(self, now: float) -> list:
+        """Pop as many ``(topic, payload)`` as the token bucket allows."""
+        with self._lock:
+            if self.rate > 0:
+                self.tokens = min(self.burst, self.tokens + (now - self._stamp) * self.rate)
+                budget = int(self.tokens)
+            else:
+                budget = len(self._queue)
+            self._stamp = now
+            batch = []
+            while self._queue and len(batch) < budget:
+                topic = self._queue.popleft()
+                self._queued.discard(topic)
+                payload = self.desired[topic][0] if topic in self.desired else ""
+                self.known[topic] = self.digest(payload)
+                batch.append((topic, payload))
+            if self.rate > 0:
+                self.tokens -= len(batch)
+            self.published += len(batch)
+            return batch
+
+    def retry(self, topics: list):
+        """Put back, in order, configs ``take`` returned but the MQTT client refused (its queue was full)."""
+        with self._lock:
+            for topic in reversed(topics):
+                self.known.pop(topic, None)
+                self.published -= 1
+                if topic not in self._queued:
+                    self._queued.add(topic)
+                    self._queue.appendleft(topic)
+
+    def next_delay(self, now: float) -> "float | None":
+        """Seconds until there is work (next token or end of verification), None when idle."""
+        delays = []
+        if self.verify_deadline is not None:
+            delays.append(max(0.0, self.verify_deadline - now))
+        if self._queue:
+            delays.append(0.0 if self.rate <= 0 or self.tokens >= 1 else (1 - self.tokens) / self.rate)
+        return min(delays) if delays else None
+
+
+class _CoalescingBuffer:
+    """
+    Latest-value buffer between the receive and publish stages.
+
+    The receiver writes the newest value per (universe, channel); a channel that
+    is already pending is overwritten (coalesced). At most ``capacity`` channels
+    are held: new channels beyond that are rejected (dropped) and, since they
+    are not committed as published, change detection offers them again on the
+    next frame.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.size = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._pending = {}  # universe -> {dmx offset: value}
+        self._since = {}  # universe -> received_at of the oldest pending value
+        self._lock = Lock()
+
+    def put(self, universe: int, offsets, data, received_at: float = 0.0) -> list:
+        """Store ``data[i]`` for each offset; returns the offsets accepted."""
+        accepted = []
+        with self._lock:
+            slot = self._pending.get(universe)
+            if slot is None:
+                slot = self._pending[universe] = {}
+                self._since[universe] = received_at
+            for i in offsets:
+                if i in slot:
+                    self.coalesced += 1
+                elif self.size >= self.capacity:
+                    self.dropped += 1
+                    continue
+                else:
+                    self.size += 1
+                slot[i] = data[i]
+                accepted.append(i)
+        return accepted
+
+    def drain(self):
+        """Take all pending values: ``({universe: {offset: value}}, {universe: received_at})``."""
+        with self._lock:
+            pending, since = self._pending, self._since
+            self._pending, self._since, self.size = {}, {}, 0
+        return pending, since
+
+
+# ---------------------------------------------------------------------------
+# Art-Net output (MQTT commands → ArtDMX)
+# ---------------------------------------------------------------------------
+class _OutputUniverse:
+    """
+    One universe driven from MQTT: a prebuilt ArtDMX datagram whose 512 data
+    bytes are the universe buffer, so commands write straight into the packet.
+    """
+
+    __slots__ = ("universe", "target", "packet", "data", "dirty", "last_sent", "sent")
+
+    def __init__(self, universe: int, host: str):
+        self.universe = universe
+        self.target = (host, ARTNET_PORT)
+        self.packet = bytearray(
+            _ARTNET_ID
+            + struct.pack("<H", _OPCODE_DMX)
+            + struct.pack(">H", 14)
+            + bytes(2)  # sequence (set per frame), physical
+            + struct.pack("<H", universe)
+            + struct.pack(">H", DMX_CHANNELS)
+            + bytes(DMX_CHANNELS)
+        )
+        self.data = memoryview(self.packet)[18:]
+        self.dirty = False
+        self.last_sent = float("-inf")
+        self.sent = 0
+
+
+class _ArtNetTransmitter:
+    """
+    Fixed-rate ArtDMX sender for the ``output`` universes.
+
+    Commands only write into the universe buffers and mark them dirty. A dirty
+    universe is sent as soon as ``min_interval`` has passed since its last
+    frame, so a burst of commands becomes one frame; every universe is resent
+    at least every ``refresh`` seconds, as Art-Net nodes expect a steady stream.
+    A universe is only sent once it received its first command, so starting
+    the bridge does not black out fixtures another controller is driving.
+    """
+
+    def __init__(self, outputs, refresh_hz: float, min_interval_s: float):
+        self.outputs = {out.universe: out for out in outputs}
+        self.refresh = 1.0 / refresh_hz
+        self.min_interval = min_interval_s
+        self.commands = 0
+        self._lock = Lock()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+
+    def write(self, universe: int, offset: int, values) -> bool:
+        """Copy ``values`` into the universe buffer at ``offset``; True if anything changed."""
+        out = self.outputs[universe]
+        end = min(offset + len(values), DMX_CHANNELS)
+        values = bytes(values[: end - offset])
+        with self._lock:
+            self.commands += 1
+            if out.data[offset:end] == values:
+                return False
+            out.data[offset:end] = values
+            out.dirty = True
+        return True
+
+    def read(self, universe: int, offset: int, count: int) -> bytes:
+        with self._lock:
+            return bytes(self.outputs[universe].data[offset:offset + count])
+
+    def pump(self, now: float) -> float:
+        """Send the universes that are due; returns seconds until the next one is."""
+        delay = self.refresh
+        with self._lock:
+            for out in self.outputs.values():
+                if not out.dirty and not out.sent:
+                    continue
+                due = out.last_sent + (self.min_interval if out.dirty else self.refresh)
+                if now >= due:
+                    out.packet[12] = out.sent % 255 + 1  # sequence 1..255 (0 = disabled)
+                    try:
+                        self._sock.sendto(out.packet, out.target)
+                    except OSError as e:
+                        logger.debug("ArtDMX to %s failed: %s", out.target[0], e)
+                    out.sent += 1
+                    out.last_sent = now
+                    out.dirty = False
+                    due = now + self.refresh
+                delay = min(delay, due - now)
+        return max(delay, 0.0)
+
+    @property
+    def frames_sent(self) -> int:
+        return sum(out.sent for out in self.outputs.values())
 
     def close(self):
         try:
@@ -90,6 +1437,475 @@ class _ArtNetListener:
         except OSError:
             pass
 
+
+# ---------------------------------------------------------------------------
+# MQTT client
+# ---------------------------------------------------------------------------
+class _MQTTClient(mqtt.Client):
+    """
+    paho client that counts its own publish backlog.
+
+    ``backlog`` is the publishes paho accepted minus the ``on_publish``
+    callbacks: QoS 0 messages not yet written to the socket plus QoS 1
+    messages not yet acknowledged. paho discards the queued QoS 0 messages
+    with a lost connection and resends the QoS 1 ones, so ``connection_lost``
+    writes off the former.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_publish = self._on_publish_done
+        self._count_lock = Lock()  # publish runs on several threads, on_publish on the network one
+        self._queued = 0  # QoS 0 accepted
+        self._written = 0  # QoS 0 written
+        self._unacked = set()  # mids of QoS 1 messages awaiting PUBACK
+
+    @property
+    def backlog(self) -> int:
+        return max(0, self._queued - self._written) + len(self._unacked)
+
+    def publish(self, topic, payload=None, qos=0, retain=False, properties=None):
+        info = super().publish(topic, payload, qos, retain, properties)
+        if qos == 0:
+            if info.rc != mqtt.MQTT_ERR_NO_CONN:  # offline QoS 0 is dropped on the spot
+                with self._count_lock:
+                    self._queued += 1
+        elif info.rc != mqtt.MQTT_ERR_QUEUE_SIZE:  # offline QoS 1 stays queued
+            with self._count_lock:
+                self._unacked.add(info.mid)
+        return info
+
+    def _on_publish_done(self, client, userdata, mid, reason_code, properties):
+        with self._count_lock:
+            if mid in self._unacked:
+                self._unacked.discard(mid)
+            else:
+                self._written += 1
+
+    def connection_lost(self):
+        """Write off the QoS 0 messages paho drops with the connection."""
+        with self._count_lock:
+            self._written = self._queued
+
+
+# ---------------------------------------------------------------------------
+# MQTT v5 topic aliases
+# ---------------------------------------------------------------------------
+class _AliasProperties(Properties):
+    """PUBLISH properties carrying only a Topic Alias, packed once (paho packs them on every publish)."""
+
+    def __init__(self, alias: int):
+        super().__init__(PacketTypes.PUBLISH)
+        self.TopicAlias = alias
+        object.__setattr__(self, "_packed", super().pack())  # Properties only accepts property names
+
+    def pack(self) -> bytes:
+        return self._packed
+
+
+class _TopicAliases:
+    """
+    Topic aliases for the hottest state topics (MQTT v5, ``mqtt.protocol: 5``).
+
+    The broker grants ``maximum`` aliases in CONNACK (Topic Alias Maximum).
+    Free aliases go to topics on their first publish until the table is full.
+    Publishes are counted per topic and every ``_REBALANCE_EVERY`` publishes
+    the table is handed to the most published topics, evicting cold ones;
+    counts are halved so the set follows the show. The first publish of a
+    topic on its alias carries the full topic to register it, later ones an
+    empty topic and the 2-byte alias. Aliases only live for one connection:
+    ``reset`` drops them on connect and disconnect. Compared with the same v5
+    PUBLISH without alias, ``bytes_saved`` counts what alias hits saved and
+    ``registration_bytes`` what registrations cost; both only grow.
+    """
+
+    _REBALANCE_EVERY = 16384
+    _PROPERTY_BYTES = 3  # Topic Alias property: identifier + 2-byte value
+
+    def __init__(self):
+        self.maximum = 0
+        self.hits = 0
+        self.bytes_saved = 0
+        self.registration_bytes = 0
+        self._assigned = {}  # topic -> [alias, registered on this connection]
+        self._free = []  # unassigned aliases, lowest last
+        self._counts = defaultdict(int)
+        self._since = 0
+        self._properties = {}  # alias -> PUBLISH Properties carrying it (built once)
+        self._lock = Lock()
+
+    def reset(self, maximum: int):
+        """Start a new connection that allows ``maximum`` aliases (0 = none)."""
+        with self._lock:
+            self.maximum = maximum
+            self._assigned = {}
+            self._free = list(range(maximum, 0, -1))
+            self._since = 0
+
+    def resolve(self, topic: str):
+        """Return ``(topic, properties)`` to publish ``topic`` with."""
+        with self._lock:
+            self._counts[topic] += 1
+            self._since += 1
+            if self._since >= self._REBALANCE_EVERY and self.maximum:
+                self._rebalance()
+            entry = self._assigned.get(topic)
+            if entry is None:
+                if not self._free:
+                    return topic, None
+                entry = self._assigned[topic] = self._entry(self._free.pop())
+            properties = self._properties[entry[0]]
+            if entry[1]:
+                self.hits += 1
+                self.bytes_saved += len(topic) - self._PROPERTY_BYTES  # state topics are ASCII
+                return "", properties
+            entry[1] = True
+            self.registration_bytes += self._PROPERTY_BYTES
+            return topic, properties
+
+    def _rebalance(self):
+        counts = self._counts
+        hot = set(heapq.nlargest(self.maximum, counts, key=counts.get))
+        assigned = {topic: entry for topic, entry in self._assigned.items() if topic in hot}
+        taken = {entry[0] for entry in assigned.values()}
+        free = [alias for alias in range(self.maximum, 0, -1) if alias not in taken]
+        for topic in hot:
+            if topic not in assigned:
+                assigned[topic] = self._entry(free.pop())
+        self._assigned = assigned
+        self._free = free
+        self._counts = defaultdict(int, {topic: n // 2 for topic, n in counts.items() if n > 1})
+        self._since = 0
+
+    def _entry(self, alias: int) -> list:
+        """A new assignment of ``alias``; registered with the full topic on its next publish."""
+        if alias not in self._properties:
+            self._properties[alias] = _AliasProperties(alias)
+        return [alias, False]
+
+
+# ---------------------------------------------------------------------------
+# Runtime metrics
+# ---------------------------------------------------------------------------
+class _Histogram:
+    """Fixed-bucket histogram (cumulative buckets are computed on render)."""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # last bucket is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (0 when empty)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return float(self.bounds[-1])
+
+
+class _Metrics:
+    """
+    Counters shared by the receive and publish paths.
+
+    Updates are plain integer increments from the listener thread; readers
+    (diagnostics publisher, OpenMetrics endpoint) only take snapshots.
+    """
+
+    LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.received = defaultdict(int)  # packets per universe (all universes)
+        self.filtered = defaultdict(int)  # packets per unrouted universe
+        self.routed = 0
+        self.publishes = 0
+        self.throttled = 0
+        self.trailing_flushes = 0
+        self.suppressed = 0
+        self.filter_held = 0
+        self.worker_dropped = 0
+        self.snapshots = 0
+        self.latency_ms = _Histogram(self.LATENCY_BUCKETS_MS)
+
+    def snapshot(self, **gauges) -> dict:
+        """Return a point-in-time copy of all counters plus the given gauges."""
+        received = dict(self.received)
+        filtered = dict(self.filtered)
+        snap = {
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "packets_received": sum(received.values()),
+            "packets_filtered": sum(filtered.values()),
+            "received_by_universe": received,
+            "filtered_by_universe": filtered,
+            "publishes": self.publishes,
+            "throttled": self.throttled,
+            "trailing_flushes": self.trailing_flushes,
+            "suppressed": self.suppressed,
+            "filter_held": self.filter_held,
+            "worker_dropped": self.worker_dropped,
+            "snapshots": self.snapshots,
+            "latency_count": self.latency_ms.count,
+            "latency_sum_ms": self.latency_ms.total,
+            "latency_buckets": list(self.latency_ms.counts),
+            "latency_p50_ms": self.latency_ms.quantile(0.5),
+            "latency_p95_ms": self.latency_ms.quantile(0.95),
+        }
+        snap.update(gauges)
+        return snap
+
+    def render_openmetrics(self, snap: dict, prefix: str = "artnet2mqtt") -> str:
+        """Render a snapshot in the OpenMetrics text exposition format."""
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+
+        family("packets_received", "counter", "ArtDMX packets received per universe.")
+        for universe, count in sorted(snap["received_by_universe"].items()):
+            lines.append(f'{prefix}_packets_received_total{{universe="{universe}"}} {count}')
+        family("packets_filtered", "counter", "ArtDMX packets dropped because their universe has no route.")
+        for universe, count in sorted(snap["filtered_by_universe"].items()):
+            lines.append(f'{prefix}_packets_filtered_total{{universe="{universe}"}} {count}')
+
+        for name, help_text in (
+            ("parse_failures", "Datagrams that are not valid Art-Net or sACN."),
+            ("ignored_opcodes", "Art-Net packets with an unhandled OpCode."),
+            ("polls_answered", "ArtPoll requests answered with ArtPollReply."),
+            ("sacn_ignored", "sACN packets ignored (preview data, non-DMX START code, non-data)."),
+            ("sacn_lower_priority", "sACN frames dropped because a higher-priority source is live."),
+            ("sequence_rejected", "Duplicate or out-of-order ArtDMX frames dropped by sequence tracking."),
+            ("artsync_received", "ArtSync packets that released held universes."),
+            ("artsync_coalesced", "ArtDMX frames replaced by a newer one while waiting for ArtSync."),
+            ("discovery_published", "Discovery config messages published (changed or missing on the broker)."),
+            ("discovery_skipped", "Discovery configs not republished because the broker already holds them."),
+            ("publishes", "MQTT state messages handed to the client."),
+            ("throttled", "Channel updates held back by throttle_ms."),
+            ("trailing_flushes", "Held channel values published when their throttle window expired."),
+            ("suppressed", "Channel updates skipped because the value did not change."),
+            ("filter_held", "Channel changes held back by deadband, hysteresis or smoothing."),
+            ("worker_dropped", "Datagrams dropped because a worker process fell behind."),
+            ("snapshots", "Retained universe snapshots published."),
+            ("pipeline_coalesced", "Pending channel values overwritten by a newer value before publishing."),
+            ("output_commands", "MQTT commands applied to output universes."),
+            ("output_frames", "ArtDMX frames sent for output universes."),
+            ("mqtt_alias_hits", "State publishes sent with a topic alias instead of the topic (MQTT v5)."),
+            ("mqtt_alias_bytes_saved", "PUBLISH bytes saved by sending a topic alias instead of the topic (MQTT v5)."),
+            ("mqtt_alias_registration_bytes", "Topic Alias property bytes spent registering aliases (MQTT v5)."),
+            ("pipeline_dropped", "Channel values rejected because the publish buffer was full."),
+        ):
+            family(name, "counter", help_text)
+            lines.append(f"{prefix}_{name}_total {snap.get(name, 0)}")
+
+        family("mqtt_queue_depth", "gauge", "Publishes not yet written (QoS 0) or acknowledged (QoS 1) by the MQTT client.")
+        lines.append(f"{prefix}_mqtt_queue_depth {snap.get('mqtt_queue_depth', 0)}")
+        family("pipeline_pending", "gauge", "Channel values waiting in the publish buffer.")
+        lines.append(f"{prefix}_pipeline_pending {snap.get('pipeline_pending', 0)}")
+        family("mqtt_topic_aliases", "gauge", "Topic aliases granted by the broker (MQTT v5).")
+        lines.append(f"{prefix}_mqtt_topic_aliases {snap.get('mqtt_topic_aliases', 0)}")
+
+        family("publish_latency_ms", "histogram", "Receive-to-publish latency in milliseconds.")
+        cumulative = 0
+        for bound, count in zip(self.LATENCY_BUCKETS_MS, snap["latency_buckets"]):
+            cumulative += count
+            lines.append(f'{prefix}_publish_latency_ms_bucket{{le="{float(bound)}"}} {cumulative}')
+        lines.append(f'{prefix}_publish_latency_ms_bucket{{le="+Inf"}} {snap["latency_count"]}')
+        lines.append(f"{prefix}_publish_latency_ms_count {snap['latency_count']}")
+        lines.append(f"{prefix}_publish_latency_ms_sum {snap['latency_sum_ms']}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+# Snapshot keys that are point-in-time values rather than counters
+_SNAPSHOT_GAUGES = (
+    "uptime_s", "mqtt_queue_depth", "pipeline_pending", "mqtt_topic_aliases", "latency_p50_ms", "latency_p95_ms",
+)
+
+
+def _merge_snapshots(snaps) -> dict:
+    """Combine metric snapshots of several processes (sums; max uptime; quantiles recomputed)."""
+    merged = {}
+    for snap in snaps:
+        for key, value in snap.items():
+            if isinstance(value, dict):
+                totals = merged.setdefault(key, {})
+                for k, v in value.items():
+                    totals[k] = totals.get(k, 0) + v
+            elif isinstance(value, list):
+                current = merged.get(key)
+                merged[key] = [a + b for a, b in zip(current, value)] if current else list(value)
+            elif key == "uptime_s":
+                merged[key] = max(merged.get(key, 0), value)
+            else:
+                merged[key] = merged.get(key, 0) + value
+    latency = _Histogram(_Metrics.LATENCY_BUCKETS_MS)
+    latency.counts = merged.get("latency_buckets", latency.counts)
+    latency.count = merged.get("latency_count", 0)
+    merged["latency_p50_ms"] = latency.quantile(0.5)
+    merged["latency_p95_ms"] = latency.quantile(0.95)
+    return merged
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves ``GET /metrics`` from ``server.render_metrics``."""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("Metrics endpoint: " + format, *args)
+
+
+# Diagnostic sensors published through MQTT Discovery: (key, name, unit, icon, state_class)
+_DIAGNOSTIC_SENSORS = (
+    ("packets_per_s", "Art-Net Packets per Second", "pkt/s", "mdi:speedometer", "measurement"),
+    ("packets_filtered", "Art-Net Packets Filtered", None, "mdi:filter-remove", "total_increasing"),
+    ("parse_failures", "Art-Net Parse Failures", None, "mdi:alert-circle-outline", "total_increasing"),
+    ("publishes_per_s", "MQTT Publishes per Second", "msg/s", "mdi:upload-network", "measurement"),
+    ("throttled", "MQTT Publishes Throttled", None, "mdi:timer-sand", "total_increasing"),
+    ("suppressed", "MQTT Publishes Suppressed", None, "mdi:filter-variant", "total_increasing"),
+    ("mqtt_queue_depth", "MQTT Queue Depth", None, "mdi:tray-full", "measurement"),
+    ("latency_p50_ms", "Publish Latency p50", "ms", "mdi:timer-outline", "measurement"),
+    ("latency_p95_ms", "Publish Latency p95", "ms", "mdi:timer-alert-outline", "measurement"),
+)
+
+# ---------------------------------------------------------------------------
+# asyncio runtime (engine: asyncio)
+# ---------------------------------------------------------------------------
+class _ArtNetProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol feeding parsed ArtDMX (or sACN) packets to the bridge dispatcher."""
+
+    def __init__(self, listener: "_ArtNetListener | _SacnListener", dispatch):
+        self._parse = listener.parse_datagram
+        self._dispatch = dispatch
+
+    def datagram_received(self, data, addr):
+        packet = self._parse(data, addr)
+        if packet is not None:
+            self._dispatch(packet)
+
+    def error_received(self, exc):
+        logger.debug("ArtNet socket error: %s", exc)
+
+
+class _AsyncioMqttAdapter:
+    """
+    Drive a paho client from an asyncio loop instead of paho's network thread.
+
+    Socket readiness goes through ``add_reader``/``add_writer``; keepalive and
+    reconnection (same backoff as ``reconnect_delay_set``) run in one coroutine.
+    """
+
+    _SOCKET_CALLBACKS = (
+        "on_socket_open",
+        "on_socket_close",
+        "on_socket_register_write",
+        "on_socket_unregister_write",
+    )
+
+    def __init__(self, loop, client, min_delay: int = 1, max_delay: int = 30):
+        self.loop = loop
+        self.client = client
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.closing = False
+        self._misc_task = None
+        client.on_socket_open = self._on_socket_open
+        client.on_socket_close = self._on_socket_close
+        client.on_socket_register_write = self._on_socket_register_write
+        client.on_socket_unregister_write = self._on_socket_unregister_write
+
+    def start(self):
+        self._misc_task = self.loop.create_task(self._misc_loop())
+
+    async def close(self, timeout: float = 1.0):
+        """Let a pending DISCONNECT flush, then detach from the loop."""
+        self.closing = True
+        deadline = self.loop.time() + timeout
+        while self.client.socket() is not None and self.loop.time() < deadline:
+            await asyncio.sleep(0.01)
+        if self._misc_task is not None:
+            self._misc_task.cancel()
+        for name in self._SOCKET_CALLBACKS:
+            setattr(self.client, name, None)
+
+    def _on_socket_open(self, client, userdata, sock):
+        self.loop.add_reader(sock, client.loop_read)
+
+    def _on_socket_close(self, client, userdata, sock):
+        self.loop.remove_reader(sock)
+        self.loop.remove_writer(sock)
+
+    def _on_socket_register_write(self, client, userdata, sock):
+        self.loop.add_writer(sock, client.loop_write)
+
+    def _on_socket_unregister_write(self, client, userdata, sock):
+        self.loop.remove_writer(sock)
+
+    async def _misc_loop(self):
+        delay = self.min_delay
+        while not self.closing:
+            if self.client.loop_misc() == mqtt.MQTT_ERR_NO_CONN and not self.closing:
+                try:
+                    self.client.reconnect()
+                    delay = self.min_delay
+                except Exception as e:
+                    logger.warning("MQTT reconnect failed: %s (retrying in %ds)", e, delay)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.max_delay)
+                    continue
+            await asyncio.sleep(1)
+
+
+# ---------------------------------------------------------------------------
+# Multi-process workers
+# ---------------------------------------------------------------------------
+class _WorkerSpec:
+    """
+    What a worker process owns: its universe shard, the worker end of the
+    socketpairs the supervisor forwards datagrams on, and a pipe for metrics.
+    """
+
+    __slots__ = ("index", "universes", "artnet_sock", "sacn_sock", "conn")
+
+    def __init__(self, index: int, universes, artnet_sock=None, sacn_sock=None, conn=None):
+        self.index = index
+        self.universes = tuple(universes)
+        self.artnet_sock = artnet_sock
+        self.sacn_sock = sacn_sock
+        self.conn = conn
+
+
+def _worker_main(spec: _WorkerSpec, options_path: str, artnet_port: int):
+    """Entry point of a worker process: a bridge restricted to one universe shard."""
+    bridge = ArtNet2MQTT(options_path=options_path, artnet_port=artnet_port, worker=spec)
+    signal.signal(signal.SIGTERM, lambda *_: bridge.stop_event.set())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the supervisor decides when to stop
+    bridge.start()
+
+
 # Configure logging (will be updated based on config)
 logging.basicConfig(
     level=logging.INFO,  # Default level, will be updated
@@ -100,20 +1916,52 @@ logger = logging.getLogger(__name__)
 
 
 class ArtNet2MQTT:
-    def __init__(self):
-        """Initialize the ArtNet to MQTT bridge."""
+    def __init__(self, options_path: str = OPTIONS_PATH, artnet_port: int = ARTNET_PORT, worker=None):
+        """Initialize the ArtNet to MQTT bridge (``worker``: a _WorkerSpec in worker processes)."""
+        self.options_path = options_path
+        self.artnet_port = artnet_port
+        self.worker = worker
         self.config = self._load_config()
         self._setup_logging()
         self._setup_mqtt()
         self._setup_artnet()
-        self.last_value = {}
-        self.last_pub_ms = defaultdict(lambda: 0)
+        self.metrics = _Metrics()
+        self.metrics_server = None
+        self.sequence_tracker = _SequenceTracker()
+        self.mergers = {}  # universe -> _HtpMerger (merge_mode: htp)
+        self.artsync = _ArtSyncBuffer()
+        self.worker_procs = {}  # index -> (multiprocessing.Process, _WorkerSpec, metrics pipe, started at)
+        self.worker_snapshots = {}  # index -> latest metrics snapshot from that worker
+        self.worker_retired = {}  # index -> counters of that worker's previous (dead) processes
+        self.worker_restarts = {}  # index -> [consecutive quick crashes, restart at (None = running)]
+        self.throttle_wheel = _TimerWheel()
+        self._wake_throttle = None  # asyncio engine: arms the flush coroutine
+        self._wake_artsync = None  # asyncio engine: arms the ArtSync timeout coroutine
+        self.discovery = _DiscoveryCache(self.discovery_rate)
+        self._discovery_wakeup = Event()
+        self._wake_discovery = self._discovery_wakeup.set  # asyncio engine swaps in its own event
+        self.state = None
+        if self.warm_start and self.routes and not self._supervising:
+            self._open_state()
+        self.transmitter = None
+        self.output_commands = {}
+        self._output_wakeup = Event()
+        self._wake_output = self._output_wakeup.set  # asyncio engine swaps in its own event
+        if self.outputs and self.worker is None:
+            self.transmitter = _ArtNetTransmitter(
+                self.outputs, self.output_refresh_hz, self.output_min_interval_ms / 1000.0
+            )
+            self.output_commands = self._output_command_topics()
+        self.pipeline = None
+        if self.publish_rate_hz > 0:
+            capacity = sum(route.watched for route in self.routes.values())
+            self.pipeline = _CoalescingBuffer(self.publish_buffer_size or capacity)
         self.stop_event = Event()
 
     def _load_config(self):
         """Load configuration from Home Assistant."""
         try:
-            with open("/data/options.json", "r") as f:
+            with open(self.options_path, "r") as f:
                 config = json.load(f)
         except FileNotFoundError:
             logger.error("Configuration file not found!")
@@ -128,21 +1976,72 @@ class ArtNet2MQTT:
         self.mqtt_port = int(os.getenv("MQTT_PORT", mqtt_config.get("port", 1883)))
         self.mqtt_user = os.getenv("MQTT_USER", mqtt_config.get("username")) or None
         self.mqtt_pass = os.getenv("MQTT_PASS", mqtt_config.get("password")) or None
+        self.mqtt_protocol = str(mqtt_config.get("protocol") or "3.1.1")
+        if self.mqtt_protocol not in ("3.1.1", "5"):
+            raise ValueError("mqtt.protocol must be '3.1.1' or '5'")
 
         # Discovery / device
         self.discovery_prefix = config.get("discovery_prefix", "homeassistant")
         self.node_name = config.get("node_name", "artnet_bridge")
         self.object_prefix = config.get("object_prefix", "artnet")
-
-        # Art-Net
-        self.universe = int(config.get("universe", 0))
-        self.start_channel = int(config.get("start_channel", 1))
-        self.total_channels = int(config.get("channels", 20))
+        self.discovery_mode = config.get("discovery_mode", "entity")
+        if self.discovery_mode not in ("entity", "device"):
+            raise ValueError("discovery_mode must be 'entity' or 'device'")
+        self.discovery_rate = float(config.get("discovery_rate", 50))
+
+        # Art-Net routing table (universe -> channel ranges)
+        self.routes = self._build_routes(config)
+        self.fixtures = self._build_fixtures(config, self.routes)
+        self.workers = int(config.get("workers", 1))
+        if not (1 <= self.workers <= 64):
+            raise ValueError("workers must be in 1..64")
+        if self.worker is not None:
+            # Worker process: only the universes of its shard
+            shard = set(self.worker.universes)
+            self.routes = {u: route for u, route in self.routes.items() if u in shard}
+            self.fixtures = [fixture for fixture in self.fixtures if fixture.universe in shard]
+        self.total_channels = sum(len(route.channels) for route in self.routes.values())
 
         # Throttle / behavior
         self.throttle_ms = int(config.get("throttle_ms", 20))
         self.publish_on_change_only = bool(config.get("publish_on_change_only", True))
+        self.settle_ms = int(config.get("settle_ms", 500))
         self.ip_publish_interval_s = int(config.get("ip_publish_interval_s", 30))
+        self.publish_rate_hz = float(config.get("publish_rate_hz", 0))
+        self.publish_buffer_size = int(config.get("publish_buffer_size", 0))
+        self.metrics_interval_s = int(config.get("metrics_interval_s", 30))
+        self.metrics_port = int(config.get("metrics_port", 0))
+        self.engine = config.get("engine", "threaded")
+        if self.engine not in ("threaded", "asyncio"):
+            raise ValueError("engine must be 'threaded' or 'asyncio'")
+        self.publish_mode = config.get("publish_mode", "channel")
+        if self.publish_mode not in ("channel", "frame"):
+            raise ValueError("publish_mode must be 'channel' or 'frame'")
+        self.artsync_enabled = bool(config.get("artsync", True))
+        self.input_protocol = config.get("input_protocol", "artnet")
+        if self.input_protocol not in ("artnet", "sacn", "both"):
+            raise ValueError("input_protocol must be 'artnet', 'sacn' or 'both'")
+        self.merge_mode = config.get("merge_mode", "ltp")
+        if self.merge_mode not in ("ltp", "htp"):
+            raise ValueError("merge_mode must be 'ltp' or 'htp'")
+        self.outputs = self._build_outputs(config)
+        self.output_refresh_hz = float(config.get("output_refresh_hz", 1.0))
+        if not (0 < self.output_refresh_hz <= 44):
+            raise ValueError("output_refresh_hz must be in (0, 44]")
+        self.output_min_interval_ms = int(config.get("output_min_interval_ms", 25))
+        if self.output_min_interval_ms < 0:
+            raise ValueError("output_min_interval_ms must be >= 0")
+        self.warm_start = bool(config.get("warm_start", True))
+        self.snapshot_interval_s = float(config.get("snapshot_interval_s", 5))
+        if self.snapshot_interval_s < 0:
+            raise ValueError("snapshot_interval_s must be >= 0")
+        if self.snapshot_interval_s > 0:
+            for route in self.routes.values():
+                route.snapshot = bytearray(DMX_CHANNELS)
+        self.capture_file = config.get("capture_file") or ""
+        self.capture_max_mb = int(config.get("capture_max_mb", 256))
+        if self.capture_max_mb < 1:
+            raise ValueError("capture_max_mb must be >= 1")
 
         # Sensor extras
         self.force_update = bool(config.get("force_update", True))
@@ -150,27 +2049,166 @@ class ArtNet2MQTT:
 
         # Topics
         self.availability_topic = f"{self.node_name}/status"
-
-        # Validate DMX range (512 channels per universe)
-        if not (0 <= self.universe <= 15):
-            raise ValueError("universe must be in 0..15")
-        if not (1 <= self.start_channel <= 512):
-            raise ValueError("start_channel must be in 1..512")
-        if not (1 <= self.total_channels <= 512):
-            raise ValueError("channels must be in 1..512")
-        if (self.start_channel - 1) + self.total_channels > 512:
-            raise ValueError("start_channel + channels - 1 cannot exceed 512")
-
+        self.diagnostics_topic = f"{self.node_name}/diagnostics"
+        for route in self.routes.values():
+            route.bind_topics(self.node_name)
+
+        for route in self.routes.values():
+            if route.ranges:
+                logger.info("🎯 Will monitor universe %s, channels %s", route.universe, route.describe())
+        for out in self.outputs:
+            logger.info("📤 Will send universe %s to %s", out.universe, out.target[0])
+        for fixture in self.fixtures:
+            logger.info(
+                "💡 Fixture %s (%s) on universe %s, channels %d-%d",
+                fixture.name,
+                fixture.profile,
+                fixture.universe,
+                fixture.start_channel,
+                fixture.start_channel + len(fixture.roles) - 1,
+            )
         logger.info(
-            "Configuration loaded - Universe: %s, Channels: %s-%s",
-            self.universe,
-            self.start_channel,
-            self.start_channel + self.total_channels - 1,
+            "Configuration loaded - %d universe(s), %d channel(s)",
+            len(self.routes),
+            self.total_channels,
         )
-        logger.info(f"🎯 Will monitor universe {self.universe}, channels {self.start_channel} to {self.start_channel + self.total_channels - 1}")
 
         return config
 
+    @staticmethod
+    def _build_routes(config):
+        """Build the universe routing table from ``universes`` (or the legacy single range)."""
+        entries = config.get("universes") or [
+            {
+                "universe": config.get("universe", 0),
+                "start_channel": config.get("start_channel", 1),
+                "channels": config.get("channels", 20),
+                "deadband": config.get("deadband", 0),
+                "hysteresis": config.get("hysteresis", 0),
+                "smoothing": config.get("smoothing", 0),
+            }
+        ]
+
+        routes = {}
+        for entry in entries:
+            universe = int(entry.get("universe", 0))
+            start_channel = int(entry.get("start_channel", 1))
+            channels = int(entry.get("channels", 20))
+            deadband = int(entry.get("deadband", 0) or 0)
+            hysteresis = int(entry.get("hysteresis", 0) or 0)
+            smoothing = float(entry.get("smoothing", 0) or 0)
+
+            # Validate Port-Address (15-bit) and DMX range (512 channels per universe)
+            if not (0 <= universe <= 32767):
+                raise ValueError("universe must be in 0..32767")
+            if not (1 <= start_channel <= 512):
+                raise ValueError("start_channel must be in 1..512")
+            if not (1 <= channels <= 512):
+                raise ValueError("channels must be in 1..512")
+            if (start_channel - 1) + channels > 512:
+                raise ValueError("start_channel + channels - 1 cannot exceed 512")
+            if not (0 <= deadband <= 255) or not (0 <= hysteresis <= 255):
+                raise ValueError("deadband and hysteresis must be in 0..255")
+            if not (0 <= smoothing < 1):
+                raise ValueError("smoothing must be in 0..1 (exclusive)")
+
+            route = routes.get(universe)
+            if route is None:
+                route = routes[universe] = _UniverseRoute(universe)
+            route.add_range(start_channel, channels, deadband, hysteresis, smoothing)
+
+        return routes
+
+    @staticmethod
+    def _build_fixtures(config, routes):
+        """Create the ``fixtures`` and attach them to their universe routes."""
+        fixtures = []
+        names = set()
+        for entry in config.get("fixtures") or []:
+            name = str(entry.get("name", ""))
+            universe = int(entry.get("universe", 0))
+            start_channel = int(entry.get("start_channel", 1))
+            profile = entry.get("profile", "rgb")
+
+            if not _FIXTURE_NAME.match(name):
+                raise ValueError("fixture name must only contain letters, digits, '_' or '-'")
+            if name in names:
+                raise ValueError(f"duplicate fixture name: {name}")
+            if profile not in _FIXTURE_PROFILES:
+                raise ValueError(f"fixture profile must be one of {', '.join(_FIXTURE_PROFILES)}")
+            if not (0 <= universe <= 32767):
+                raise ValueError("universe must be in 0..32767")
+            if not (1 <= start_channel <= 512):
+                raise ValueError("start_channel must be in 1..512")
+            if start_channel - 1 + len(_FIXTURE_PROFILES[profile]) > 512:
+                raise ValueError(f"fixture {name} does not fit in the universe")
+
+            fixture = _Fixture(name, universe, start_channel, profile)
+            route = routes.get(universe)
+            if route is None:
+                route = routes[universe] = _UniverseRoute(universe)
+            route.add_fixture(fixture)
+            fixtures.append(fixture)
+            names.add(name)
+        return fixtures
+
+    @staticmethod
+    def _build_outputs(config):
+        """Create the ``output`` universes (MQTT commands → ArtDMX)."""
+        outputs = []
+        seen = set()
+        for entry in config.get("output") or []:
+            universe = int(entry.get("universe", 0))
+            host = entry.get("host") or "255.255.255.255"
+            if not (0 <= universe <= 32767):
+                raise ValueError("universe must be in 0..32767")
+            if universe in seen:
+                raise ValueError(f"duplicate output universe: {universe}")
+            outputs.append(_OutputUniverse(universe, host))
+            seen.add(universe)
+        return outputs
+
+    def _output_command_topics(self) -> dict:
+        """Map each output command topic to ``(universe, dmx offset | None, fixture | None)``."""
+        commands = {}
+        for out in self.outputs:
+            base = f"{self.node_name}/u/{out.universe}"
+            commands[f"{base}/set"] = (out.universe, None, None)
+            for ch in range(1, DMX_CHANNELS + 1):
+                commands[f"{base}/ch/{ch}/set"] = (out.universe, ch - 1, None)
+        for fixture in self.fixtures:
+            if fixture.universe in self.transmitter.outputs and fixture.component == "light":
+                commands[f"{fixture.topic}/set"] = (fixture.universe, fixture.offset, fixture)
+        return commands
+
+    def _open_state(self):
+        """Resume change detection from the last frames published before the restart."""
+        name = "dmx_state.bin" if self.worker is None else f"dmx_state_w{self.worker.index}.bin"
+        path = os.path.join(os.path.dirname(os.path.abspath(self.options_path)), name)
+        # Anything that changes the published topics or payloads invalidates the state
+        fingerprint = hashlib.blake2b(
+            json.dumps([
+                self.node_name,
+                self.publish_mode,
+                self.workers,
+                [(f.name, f.universe, f.start_channel, f.profile) for f in self.fixtures],
+            ]).encode(),
+            digest_size=8,
+        ).digest()
+        try:
+            self.state = _StateFile(path, fingerprint, self.routes)
+        except OSError as e:
+            logger.warning("Warm start disabled, cannot open %s: %s", path, e)
+            return
+        restored = 0
+        for route in self.routes.values():
+            self.state.attach(route)
+            restored += bytes(route.seen).count(0xFF)
+        if restored:
+            logger.info("♻️ Warm start: %d channel(s) restored from %s", restored, path)
+        else:
+            logger.info("Warm start: no previous state in %s", path)
+
     def _setup_logging(self):
         """Configure logging based on user's log level setting."""
         log_level = self.config.get("log_level", "info").upper()
@@ -199,15 +2237,21 @@ class ArtNet2MQTT:
 
     def _setup_mqtt(self):
         """Setup MQTT client."""
-        self.client = mqtt.Client(
-            client_id=self.node_name,
+        client_id = self.node_name
+        if self.worker is not None:
+            client_id = f"{self.node_name}_w{self.worker.index}"  # one MQTT session per worker
+        self.client = _MQTTClient(
+            client_id=client_id,
             callback_api_version=mqtt.CallbackAPIVersion.VERSION2,
+            protocol=mqtt.MQTTv5 if self.mqtt_protocol == "5" else mqtt.MQTTv311,
         )
+        self.topic_aliases = _TopicAliases() if self.mqtt_protocol == "5" else None
         if self.mqtt_user:
             self.client.username_pw_set(self.mqtt_user, self.mqtt_pass)
 
-        # LWT
-        self.client.will_set(self.availability_topic, "offline", qos=1, retain=True)
+        # LWT (availability belongs to the supervisor, not to workers)
+        if self.worker is None:
+            self.client.will_set(self.availability_topic, "offline", qos=1, retain=True)
 
         # Callbacks
         self.client.on_connect = self._on_mqtt_connect
@@ -220,8 +2264,57 @@ class ArtNet2MQTT:
 
     def _setup_artnet(self):
         """Setup ArtNet receiver (pure-Python UDP socket, no native deps)."""
-        self.artnet = _ArtNetListener()
-        logger.info("ArtNet UDP listener bound to 0.0.0.0:%d", ARTNET_PORT)
+        self.artnet = None
+        self.sacn = None
+        if self.worker is not None:
+            # Datagrams arrive from the supervisor's dispatcher
+            if self.worker.artnet_sock is not None:
+                self.artnet = _ForwardedArtNetListener(sock=self.worker.artnet_sock)
+            if self.worker.sacn_sock is not None:
+                self.sacn = _SacnListener(self.routes, sock=self.worker.sacn_sock)
+            return
+        if self.input_protocol in ("artnet", "both"):
+            self.artnet = _ArtNetListener(port=self.artnet_port)
+            logger.info("ArtNet UDP listener bound to 0.0.0.0:%d", self.artnet_port)
+            self._update_poll_replies(self._get_local_ip())
+        if self.input_protocol in ("sacn", "both"):
+            self.sacn = _SacnListener(self.routes)
+            logger.info(
+                "sACN listener bound to 0.0.0.0:%d, joined universes %s",
+                SACN_PORT,
+                ", ".join(str(u) for u in self.sacn.joined) or "none",
+            )
+        if self.capture_file:
+            self._start_capture()
+
+    def _start_capture(self):
+        """Record every received ArtDMX frame to ``capture_file`` (see benchmark/replay.py)."""
+        if self.artnet is None:
+            logger.warning("capture_file is set but Art-Net input is disabled; nothing to capture")
+            return
+        if self.workers > 1:
+            logger.warning("capture_file is not supported with workers > 1; capture disabled")
+            return
+        try:
+            os.makedirs(os.path.dirname(self.capture_file) or ".", exist_ok=True)
+            self.artnet.capture = _CaptureWriter(self.capture_file, self.capture_max_mb * 1024 * 1024)
+        except OSError as e:
+            logger.error("Cannot open capture file %s: %s", self.capture_file, e)
+            return
+        logger.info("📼 Capturing ArtDMX to %s (up to %d MB)", self.capture_file, self.capture_max_mb)
+
+    @property
+    def _listeners(self) -> list:
+        """Active input listeners (Art-Net and/or sACN)."""
+        return [listener for listener in (self.artnet, self.sacn) if listener is not None]
+
+    def _update_poll_replies(self, ip: str):
+        """(Re)build the ArtPollReply pages advertising the routed universes from ``ip``."""
+        if self.artnet is None:
+            return
+        self.artnet.poll_replies = _artpoll_replies(
+            ip, self.routes, self.node_name, "Art-Net2MQTT Home Assistant bridge"
+        )
 
     # ---------- MQTT callbacks ----------
 
@@ -229,31 +2322,124 @@ class ArtNet2MQTT:
         """Callback for MQTT connection (Paho v2 signature)."""
         if reason_code == 0:
             logger.info("Connected to MQTT broker %s:%s", self.mqtt_host, self.mqtt_port)
+            if self.topic_aliases is not None:
+                self._apply_connack_limits(client, properties)
+            if self.worker is not None:
+                return  # workers only publish channel states
             client.publish(self.availability_topic, "online", qos=1, retain=True)
             # Reenviar discovery quando o HA voltar
             client.subscribe("homeassistant/status", qos=0)
-            self._publish_discovery()
+            if self.transmitter is not None:
+                client.subscribe([
+                    (f"{self.node_name}/u/{out.universe}/{suffix}", 0)
+                    for out in self.outputs
+                    for suffix in ("set", "ch/+/set")
+                ] + [(topic, 0) for topic, (_, _, fixture) in self.output_commands.items() if fixture])
+            self._sync_discovery(verify=True)
         else:
             logger.error("Failed to connect to MQTT broker: %s", reason_code)
 
     def _on_mqtt_disconnect(self, client, userdata, flags, reason_code, properties):
         """Callback for MQTT disconnection."""
         logger.warning("Disconnected from MQTT broker: %s", reason_code)
+        client.connection_lost()
+        if self.topic_aliases is not None:
+            self.topic_aliases.reset(0)
+
+    def _apply_connack_limits(self, client, properties):
+        """MQTT v5: size topic aliases and the QoS 1 in-flight window and queue from the broker's CONNACK."""
+        alias_max = getattr(properties, "TopicAliasMaximum", 0)
+        receive_max = getattr(properties, "ReceiveMaximum", 65535)
+        self.topic_aliases.reset(alias_max)
+        # QoS 1 (discovery, availability) may use the broker's whole window, with at most
+        # one more window queued behind it; QoS 0 state publishes never wait on either
+        inflight = min(receive_max, 1000)
+        client.max_inflight_messages_set(inflight)
+        client.max_queued_messages_set(2 * inflight)
+        logger.info("MQTT v5: %d topic alias(es), receive maximum %d", alias_max, receive_max)
+        if not alias_max:
+            logger.warning("Broker grants no topic aliases; raise max_topic_alias on the broker")
+
+    def _publish_aliased(self, topic, payload, qos=0, retain=False):
+        """Publish a state message through the topic alias table (MQTT v5)."""
+        topic, properties = self.topic_aliases.resolve(topic)
+        return self.client.publish(topic, payload, qos=qos, retain=retain, properties=properties)
 
     def _on_mqtt_message(self, client, userdata, msg):
-        """Handle misc MQTT messages (e.g., HA birth)."""
+        """Handle misc MQTT messages (e.g., HA birth, retained discovery replays)."""
+        if self.discovery.observe(msg.topic, msg.payload):
+            return
+        command = self.output_commands.get(msg.topic)
+        if command is not None:
+            try:
+                self._apply_output_command(*command, msg.payload)
+            except (ValueError, TypeError, AttributeError) as e:
+                logger.warning("Ignoring invalid command on %s: %s", msg.topic, e)
+            return
         if msg.topic == "homeassistant/status":
             payload = (msg.payload or b"").decode(errors="ignore").strip().lower()
             if payload == "online":
-                logger.info("Home Assistant is online; re-publishing discovery.")
-                self._publish_discovery()
+                logger.info("Home Assistant is online; re-syncing discovery.")
+                self._sync_discovery()
+
+    # ---------- Art-Net output ----------
+
+    def _apply_output_command(self, universe: int, offset, fixture, payload: bytes):
+        """
+        Write one MQTT command into its output universe.
+
+        ``.../ch/{ch}/set`` takes a value 0-255; the universe ``set`` topic takes
+        a JSON list (values from channel 1) or an object ``{"channel": value}``;
+        fixture lights take Home Assistant JSON-schema light commands and
+        answer with the state now in the output buffer, since Art-Net input
+        only reflects it when the universe is looped back.
+        """
+        transmitter = self.transmitter
+        if fixture is not None:
+            raw = transmitter.read(universe, offset, len(fixture.roles))
+            raw = fixture.encode(json.loads(payload), raw)
+            changed = transmitter.write(universe, offset, raw)
+            publish = self.client.publish if self.topic_aliases is None else self._publish_aliased
+            publish(fixture.topic, json.dumps(fixture.decode(raw), separators=(",", ":")), qos=0, retain=False)
+            self.metrics.publishes += 1
+        elif offset is not None:
+            value = int(payload)
+            if not (0 <= value <= 255):
+                raise ValueError(f"value {value} out of range 0..255")
+            changed = transmitter.write(universe, offset, (value,))
+        else:
+            frame = json.loads(payload)
+            if isinstance(frame, list):
+                if len(frame) > DMX_CHANNELS or not all(0 <= int(v) <= 255 for v in frame):
+                    raise ValueError("expected up to 512 values in 0..255")
+                changed = transmitter.write(universe, 0, [int(v) for v in frame])
+            else:
+                changed = False
+                for ch, value in frame.items():
+                    ch, value = int(ch), int(value)
+                    if not (1 <= ch <= DMX_CHANNELS and 0 <= value <= 255):
+                        raise ValueError(f"invalid channel/value {ch}={value}")
+                    changed |= transmitter.write(universe, ch - 1, (value,))
+        if changed and self._wake_output is not None:
+            self._wake_output()
+
+    def _output_thread(self):
+        """Thread sending the output universes (see _ArtNetTransmitter)."""
+        wakeup = self._output_wakeup
+        while not self.stop_event.is_set():
+            wakeup.clear()
+            wakeup.wait(self.transmitter.pump(time.monotonic()))
 
     # ---------- Discovery ----------
 
-    def _publish_discovery(self):
-        """Publish Home Assistant MQTT Discovery configuration."""
-        logger.info("Publishing MQTT Discovery configuration...")
+    def _discovery_configs(self):
+        """
+        Build the discovery configs; returns ``(configs, candidates)``.
 
+        ``configs`` are the ``(topic, payload)`` pairs to keep retained for the
+        configured ``discovery_mode``; ``candidates`` are every topic this bridge
+        may have retained in either mode, so stale ones can be cleared.
+        """
         device = {
             "identifiers": [self.node_name],
             "name": "ArtNet Bridge",
@@ -261,44 +2447,168 @@ class ArtNet2MQTT:
             "model": "ArtNet to MQTT Bridge",
             "sw_version": "1.0.0",
         }
+        entities = []  # (component, object_id, config without device)
+        retired = []  # topics of the other platform a fixture may have been announced on
 
         # Bridge IP sensor (diagnóstico)
-        ip_unique_id = f"{self.node_name}_ip"
-        ip_object_id = f"{self.object_prefix}_eth_ip"
-        ip_discovery_topic = f"{self.discovery_prefix}/sensor/{ip_object_id}/config"
-        ip_config = {
-            "name": "Bridge IP Address",
-            "unique_id": ip_unique_id,
-            "state_topic": f"{self.node_name}/eth/ip",
-            "availability_topic": self.availability_topic,
-            "device": device,
-            "icon": "mdi:ip-network",
-            "entity_category": "diagnostic",
-        }
-        self.client.publish(ip_discovery_topic, json.dumps(ip_config), retain=True, qos=1)
+        entities.append((
+            "sensor",
+            f"{self.object_prefix}_eth_ip",
+            {
+                "name": "Bridge IP Address",
+                "unique_id": f"{self.node_name}_ip",
+                "state_topic": f"{self.node_name}/eth/ip",
+                "availability_topic": self.availability_topic,
+                "icon": "mdi:ip-network",
+                "entity_category": "diagnostic",
+            },
+        ))
+
+        # Runtime metrics sensors (diagnóstico)
+        if self.metrics_interval_s > 0:
+            for key, name, unit, icon, state_class in _DIAGNOSTIC_SENSORS:
+                diag_config = {
+                    "name": name,
+                    "unique_id": f"{self.node_name}_{key}",
+                    "state_topic": self.diagnostics_topic,
+                    "value_template": f"{{{{ value_json.{key} }}}}",
+                    "availability_topic": self.availability_topic,
+                    "icon": icon,
+                    "entity_category": "diagnostic",
+                    "state_class": state_class,
+                }
+                if unit:
+                    diag_config["unit_of_measurement"] = unit
+                entities.append(("sensor", f"{self.object_prefix}_{key}", diag_config))
 
         # DMX channel sensors
-        for ch in range(self.start_channel, self.start_channel + self.total_channels):
-            unique_id = f"{self.node_name}_u{self.universe}_ch{ch}"
-            object_id = f"{self.object_prefix}_u{self.universe}_ch{ch}"
-            discovery_topic = f"{self.discovery_prefix}/sensor/{object_id}/config"
-
+        for route in self.routes.values():
+            universe = route.universe
+            for ch in route.channels:
+                config = {
+                    "name": f"DMX U{universe} CH{ch}",
+                    "unique_id": f"{self.node_name}_u{universe}_ch{ch}",
+                    "state_topic": route.topics[ch - 1],
+                    "availability_topic": self.availability_topic,
+                    "state_class": "measurement",
+                    "icon": "mdi:lightbulb-on",
+                    "force_update": self.force_update,
+                }
+                if self.publish_mode == "frame":
+                    # Frame payloads only carry changed channels; keep the state otherwise
+                    config["state_topic"] = route.frame_topic
+                    config["value_template"] = (
+                        f"{{{{ value_json['{ch}'] if '{ch}' in value_json else this.state }}}}"
+                    )
+                if isinstance(self.expire_after, int) and self.expire_after > 0:
+                    config["expire_after"] = self.expire_after
+                entities.append(("sensor", f"{self.object_prefix}_u{universe}_ch{ch}", config))
+
+        # Fixtures: one entity per channel group
+        outputs = self.transmitter.outputs if self.transmitter is not None else ()
+        for fixture in self.fixtures:
+            component = fixture.component
             config = {
-                "name": f"DMX U{self.universe} CH{ch}",
-                "unique_id": unique_id,
-                "state_topic": f"{self.node_name}/u/{self.universe}/ch/{ch}",
+                "name": fixture.name,
+                "unique_id": f"{self.node_name}_fx_{fixture.name}",
+                "state_topic": fixture.topic,
                 "availability_topic": self.availability_topic,
+            }
+            if component == "light" and fixture.universe not in outputs:
+                # Input only: nothing applies light commands, so no toggle in HA
+                component = "sensor"
+                retired.append(f"{self.discovery_prefix}/light/{self.object_prefix}_fx_{fixture.name}/config")
+                config.update({
+                    "value_template": "{{ value_json.brightness }}",
+                    "json_attributes_topic": fixture.topic,
+                    "icon": "mdi:lightbulb-on",
+                })
+            elif component == "light":
+                config.update({
+                    "schema": "json",
+                    "command_topic": f"{fixture.topic}/set",
+                    "brightness": True,
+                    "brightness_scale": fixture.brightness_scale,
+                    "supported_color_modes": [fixture.color_mode],
+                })
+                retired.append(f"{self.discovery_prefix}/sensor/{self.object_prefix}_fx_{fixture.name}/config")
+            else:
+                config.update({
+                    "value_template": "{{ value_json.pan }}",
+                    "json_attributes_topic": fixture.topic,
+                    "icon": "mdi:axis-arrow",
+                })
+            entities.append((component, f"{self.object_prefix}_fx_{fixture.name}", config))
+
+        entity_topics = [
+            f"{self.discovery_prefix}/{component}/{object_id}/config" for component, object_id, _ in entities
+        ]
+        device_topic = f"{self.discovery_prefix}/device/{self.node_name}/config"
+
+        if self.discovery_mode == "device":
+            # Um único payload com todos os componentes (HA 2024.11+)
+            payload = {
                 "device": device,
-                "state_class": "measurement",
-                "icon": "mdi:lightbulb-on",
-                "force_update": self.force_update,
+                "origin": {"name": "Art-Net2MQTT", "sw_version": "1.0.0"},
+                "components": {
+                    object_id: {"platform": component, **config} for component, object_id, config in entities
+                },
             }
-            if isinstance(self.expire_after, int) and self.expire_after > 0:
-                config["expire_after"] = self.expire_after
-
-            self.client.publish(discovery_topic, json.dumps(config), retain=True, qos=1)
-
-        logger.info("Published discovery for %d DMX channels", self.total_channels)
+            configs = [(device_topic, json.dumps(payload))]
+        else:
+            configs = [
+                (topic, json.dumps({**config, "device": device}))
+                for topic, (_, _, config) in zip(entity_topics, entities)
+            ]
+        return configs, entity_topics + [device_topic] + retired
+
+    def _sync_discovery(self, verify: bool = False):
+        """
+        Queue the discovery configs the broker does not already hold.
+
+        With ``verify`` (on connect) the bridge subscribes to its own config
+        topics first: the broker replays what it has retained, and only missing,
+        changed or stale configs are queued once ``_DISCOVERY_VERIFY_S`` elapsed.
+        """
+        configs, candidates = self._discovery_configs()
+        self.discovery.set_desired(configs)
+        if verify:
+            self.client.subscribe([(topic, 0) for topic in candidates])
+            self.discovery.begin_verify(candidates, time.monotonic() + _DISCOVERY_VERIFY_S)
+            logger.info("Checking %d retained discovery config(s) on the broker...", len(candidates))
+        elif self.discovery.verify_deadline is None:
+            queued = self.discovery.enqueue_changes()
+            logger.info("Discovery re-sync: %d config(s) queued", queued)
+        if self._wake_discovery is not None:
+            self._wake_discovery()
+
+    def _pump_discovery(self):
+        """Publish queued discovery configs within the token bucket; returns seconds until next work."""
+        cache = self.discovery
+        now = time.monotonic()
+        if cache.verify_deadline is not None and now >= cache.verify_deadline:
+            self.client.unsubscribe(cache.finish_verify())
+            logger.info("Discovery: %d message(s) queued after checking the broker", cache.pending)
+        refused = []
+        for topic, payload in cache.take(now):
+            if self.client.publish(topic, payload, qos=1, retain=True).rc == mqtt.MQTT_ERR_QUEUE_SIZE:
+                refused.append(topic)  # QoS 1 queue full (sized from the broker's Receive Maximum)
+        if refused:
+            cache.retry(refused)
+            return _DISCOVERY_RETRY_S
+        return cache.next_delay(now)
+
+    def _discovery_thread(self):
+        """Thread publishing discovery configs at ``discovery_rate``."""
+        wakeup = self._discovery_wakeup
+        while not self.stop_event.is_set():
+            wakeup.clear()
+            try:
+                delay = self._pump_discovery()
+            except Exception as e:
+                logger.error("Error publishing discovery: %s", e)
+                delay = 1.0
+            wakeup.wait(delay)
 
     # ---------- Helpers ----------
 
@@ -311,217 +2621,818 @@ class ArtNet2MQTT:
         except Exception:
             return "0.0.0.0"
 
+    def _publish_ip(self, last_sent):
+        """Publish the bridge IP when it changed; returns the last IP sent."""
+        try:
+            current_ip = self._get_local_ip()
+            if current_ip != last_sent:
+                self._update_poll_replies(current_ip)
+                self.client.publish(f"{self.node_name}/eth/ip", current_ip, qos=1, retain=True)
+                logger.debug("Published IP: %s", current_ip)
+                return current_ip
+        except Exception as e:
+            logger.error("Error publishing IP: %s", e)
+        return last_sent
+
     def _ip_publisher_thread(self):
         """Thread to publish IP address periodically."""
         last_sent = ""
         while not self.stop_event.is_set():
-            try:
-                current_ip = self._get_local_ip()
-                if current_ip != last_sent:
-                    self.client.publish(f"{self.node_name}/eth/ip", current_ip, qos=1, retain=True)
-                    logger.debug("Published IP: %s", current_ip)
-                    last_sent = current_ip
-            except Exception as e:
-                logger.error("Error publishing IP: %s", e)
-
+            last_sent = self._publish_ip(last_sent)
             self.stop_event.wait(max(5, self.ip_publish_interval_s))
 
-    # ---------- DMX publishing policy ----------
+    def _metrics_snapshot(self):
+        """Collect counters from the bridge, the listeners, the MQTT client and any workers."""
+        snap = self._local_snapshot()
+        if self.worker_snapshots or self.worker_retired:
+            return _merge_snapshots([
+                snap, *list(self.worker_snapshots.values()), *list(self.worker_retired.values())
+            ])
+        return snap
+
+    def _local_snapshot(self):
+        pipeline = self.pipeline
+        return self.metrics.snapshot(
+            parse_failures=sum(listener.parse_failures for listener in self._listeners),
+            ignored_opcodes=self.artnet.ignored_opcodes if self.artnet else 0,
+            polls_answered=self.artnet.polls_answered if self.artnet else 0,
+            sacn_ignored=self.sacn.ignored if self.sacn else 0,
+            sacn_lower_priority=self.sacn.lower_priority if self.sacn else 0,
+            sequence_rejected=self.sequence_tracker.rejected,
+            artsync_received=self.artsync.received,
+            artsync_coalesced=self.artsync.coalesced,
+            discovery_published=self.discovery.published,
+            discovery_skipped=self.discovery.skipped,
+            mqtt_queue_depth=self.client.backlog,
+            pipeline_pending=pipeline.size if pipeline else 0,
+            pipeline_coalesced=pipeline.coalesced if pipeline else 0,
+            pipeline_dropped=pipeline.dropped if pipeline else 0,
+            output_commands=self.transmitter.commands if self.transmitter else 0,
+            output_frames=self.transmitter.frames_sent if self.transmitter else 0,
+            mqtt_topic_aliases=self.topic_aliases.maximum if self.topic_aliases else 0,
+            mqtt_alias_hits=self.topic_aliases.hits if self.topic_aliases else 0,
+            mqtt_alias_bytes_saved=self.topic_aliases.bytes_saved if self.topic_aliases else 0,
+            mqtt_alias_registration_bytes=self.topic_aliases.registration_bytes if self.topic_aliases else 0,
+        )
 
-    def _should_publish(self, channel, value):
-        """Check if channel value should be published based on throttling and change detection."""
-        now = int(time.time() * 1000)
-        prev = self.last_value.get(channel)
+    def _render_metrics(self):
+        return self.metrics.render_openmetrics(self._metrics_snapshot())
 
-        # Se change-only estiver ativo, não republicar o mesmo valor
-        if self.publish_on_change_only and prev is not None and prev == value:
-            return False
+    def _publish_metrics(self, prev):
+        """Publish the diagnostics payload; returns the snapshot used as next baseline."""
+        try:
+            snap = self._metrics_snapshot()
+            elapsed = max(snap["uptime_s"] - prev["uptime_s"], 0.001)
+            payload = {key: snap.get(key) for key, _, _, _, _ in _DIAGNOSTIC_SENSORS}
+            payload["packets_per_s"] = round((snap["packets_received"] - prev["packets_received"]) / elapsed, 1)
+            payload["publishes_per_s"] = round((snap["publishes"] - prev["publishes"]) / elapsed, 1)
+            self.client.publish(self.diagnostics_topic, json.dumps(payload), qos=0, retain=False)
+            return snap
+        except Exception as e:
+            logger.error("Error publishing metrics: %s", e)
+            return prev
+
+    def _metrics_publisher_thread(self):
+        """Thread to publish runtime metrics for the diagnostic sensors."""
+        prev = self._metrics_snapshot()
+        while not self.stop_event.wait(self.metrics_interval_s):
+            prev = self._publish_metrics(prev)
+
+    def _publish_snapshots(self):
+        """Publish the retained snapshot of every universe that changed since the last one."""
+        if not self.client.is_connected():
+            return  # still dirty; sent after the reconnect
+        for route in self.routes.values():
+            if route.snapshot_dirty:
+                route.snapshot_dirty = False
+                payload = base64.b64encode(route.snapshot)
+                self.client.publish(route.snapshot_topic, payload, qos=0, retain=True)
+                self.metrics.snapshots += 1
+
+    def _snapshot_thread(self):
+        """Thread refreshing the retained universe snapshots every ``snapshot_interval_s``."""
+        while not self.stop_event.wait(self.snapshot_interval_s):
+            try:
+                self._publish_snapshots()
+            except Exception as e:
+                logger.error("Error publishing snapshots: %s", e)
 
-        if self.throttle_ms > 0:
-            if (now - self.last_pub_ms[channel]) < self.throttle_ms:
-                return False
+    def _start_metrics_server(self):
+        """Serve OpenMetrics text on ``metrics_port`` (0 disables)."""
+        try:
+            server = ThreadingHTTPServer(("0.0.0.0", self.metrics_port), _MetricsHandler)
+        except OSError as e:
+            logger.error("Cannot bind metrics endpoint on port %s: %s", self.metrics_port, e)
+            return
+        server.daemon_threads = True
+        server.render_metrics = self._render_metrics
+        self.metrics_server = server
+        Thread(target=server.serve_forever, daemon=True).start()
+        logger.info("OpenMetrics endpoint on http://0.0.0.0:%d/metrics", self.metrics_port)
 
-        self.last_value[channel] = value
-        self.last_pub_ms[channel] = now
-        return True
+    # ---------- DMX publishing policy ----------
+
+    def _channels_to_publish(self, route, data, now_ms):
+        """Return ``(offsets, values)`` to publish after change detection, filters and throttling."""
+        if route.scheduled:
+            # Pending trailing-edge flushes must see the newest value
+            length = min(len(data), DMX_CHANNELS)
+            route.latest[:length] = data[:length]
+        offsets = route.diff(data, self.publish_on_change_only)
+        metrics = self.metrics
+        metrics.suppressed += route.watched - len(offsets)
+        values = data
+        if offsets and route.filters:
+            offsets, held, values = route.filter(offsets, data, now_ms)
+            if held:
+                metrics.filter_held += len(held)
+                self._hold_throttled(route, held, data, now_ms)
+        if offsets and self.throttle_ms > 0:
+            last_pub_ms = route.last_pub_ms
+            limit = now_ms - self.throttle_ms
+            ready = [i for i in offsets if last_pub_ms[i] <= limit]
+            if len(ready) != len(offsets):
+                held = [i for i in offsets if last_pub_ms[i] > limit]
+                metrics.throttled += len(held)
+                self._hold_throttled(route, held, data, now_ms)
+            offsets = ready
+        return offsets, values
+
+    def _release_at(self, route, i):
+        """Earliest time a held channel may be flushed: throttle window and, on filtered routes, settled."""
+        deadline = route.last_pub_ms[i] + self.throttle_ms
+        if route.filters:
+            deadline = max(deadline, route.changed_ms[i] + self.settle_ms)
+        return deadline
+
+    def _hold_throttled(self, route, offsets, data, now_ms):
+        """Schedule a trailing-edge flush for channels held back by the throttle or the filters."""
+        if not route.scheduled:
+            length = min(len(data), DMX_CHANNELS)
+            route.latest[:length] = data[:length]
+        scheduled = route.scheduled
+        wheel = self.throttle_wheel
+        armed = wheel.size
+        for i in offsets:
+            if i not in scheduled:
+                scheduled.add(i)
+                wheel.schedule((route, i), self._release_at(route, i), now_ms)
+        if not armed and wheel.size and self._wake_throttle is not None:
+            self._wake_throttle()
+
+    def _flush_throttled(self):
+        """Publish held channel values whose throttle window has expired (and, if filtered, settled)."""
+        now_ms = time.monotonic() * 1000
+        wheel = self.throttle_wheel
+        due = defaultdict(list)
+        for route, i in wheel.advance(now_ms):
+            if route.filters:
+                settle_at = route.changed_ms[i] + self.settle_ms
+                if settle_at > now_ms:
+                    wheel.schedule((route, i), settle_at, now_ms)  # still moving
+                    continue
+            route.scheduled.discard(i)
+            due[route].append(i)
+        limit = now_ms - self.throttle_ms
+        for route, offsets in due.items():
+            latest = route.latest
+            published = route.published
+            last_pub_ms = route.last_pub_ms
+            ready = []
+            for i in offsets:
+                if latest[i] == published[i] and self.publish_on_change_only:
+                    continue
+                if last_pub_ms[i] > limit:
+                    # Published on the leading edge while held; hold the newer value for the next window
+                    route.scheduled.add(i)
+                    wheel.schedule((route, i), self._release_at(route, i), now_ms)
+                    continue
+                ready.append(i)
+            offsets = sorted(ready)
+            if not offsets:
+                continue
+            if self.pipeline is not None:
+                offsets = self.pipeline.put(route.universe, offsets, latest)
+            else:
+                offsets = self._publish_offsets(route, offsets, latest)
+            if route.filters:
+                # Settled on the exact raw value; filters restart from there
+                for i in offsets:
+                    if latest[i] != published[i]:
+                        route.direction[i] = 1 if latest[i] > published[i] else -1
+                    route.ema[i] = latest[i]
+            route.commit(offsets, latest, now_ms)
+            self.metrics.trailing_flushes += len(offsets)
 
     # ---------- Art-Net handling ----------
 
     def _on_artnet_frame(self, frame):
         """Handle incoming ArtNet frame (expects .universe and .data)."""
-        # Filtra universos diferentes do configurado
-        if frame.universe != self.universe:
-            logger.debug(f"🔄 Filtering out frame from universe {frame.universe} (configured: {self.universe})")
+        # O(1) routing table lookup; universes without a route are dropped
+        route = self.routes.get(frame.universe)
+        if route is None:
+            logger.debug("🔄 Filtering out frame from unrouted universe %s", frame.universe)
             return
 
         dmx_data = frame.data
-        published_count = 0
-        publications = []
-
-        logger.debug(f"📡 Processing frame with {len(dmx_data)} DMX channels for universe {frame.universe}")
-
-        for i in range(self.total_channels):
-            channel = self.start_channel + i
-            dmx_index = channel - 1
+        if route.snapshot is not None:
+            route.update_snapshot(dmx_data)
+        now_ms = time.monotonic() * 1000
+        offsets, dmx_data = self._channels_to_publish(route, dmx_data, now_ms)
+        if not offsets:
+            logger.debug("🔄 No channels needed publishing (throttle/change-only active)")
+            return
 
-            if dmx_index >= len(dmx_data):
-                logger.debug(f"⚠️  Channel {channel} (index {dmx_index}) exceeds DMX data length {len(dmx_data)}")
-                break
+        if self.pipeline is not None:
+            # Receive stage only hands the newest values to the publish stage
+            accepted = self.pipeline.put(route.universe, offsets, dmx_data, frame.received_at)
+            route.commit(accepted, dmx_data, now_ms)
+            return
 
-            value = int(dmx_data[dmx_index])
+        published = self._publish_offsets(route, offsets, dmx_data, frame.received_at)
+        route.commit(published, dmx_data, now_ms)
+
+    def _publish_offsets(self, route, offsets, values, received_at=0.0):
+        """Publish ``values[i]`` for each DMX offset in the configured mode; returns offsets sent."""
+        fixture_offsets = []
+        if route.fixture_at:
+            fixture_offsets = self._publish_fixtures(route, offsets, values)
+            topics = route.topics
+            offsets = [i for i in offsets if i in topics]
+        if not offsets:
+            published = []
+        elif self.publish_mode == "frame":
+            published = self._publish_frame(route, offsets, values)
+        else:
+            published = self._publish_channels(route, offsets, values)
+        if (published or fixture_offsets) and received_at:
+            self.metrics.latency_ms.observe(time.monotonic() * 1000 - received_at * 1000)
 
-            if self._should_publish(channel, value):
-                topic = f"{self.node_name}/u/{self.universe}/ch/{channel}"
-                try:
-                    # QoS 0 and no retain for high volume
-                    self.client.publish(topic, str(value), qos=0, retain=False)
-                    published_count += 1
-                    publications.append(f"CH{channel}={value}")
-                    
-                    # Log individual for initial publications
-                    if published_count <= 5:
-                        logger.info(f"📤 Published: {topic} = {value}")
-                        
-                except Exception as e:
-                    logger.error("Error publishing channel %s: %s", channel, e)
+        if published and logger.isEnabledFor(logging.INFO):
+            preview = ", ".join(f"U{route.universe}CH{i + 1}={values[i]}" for i in published[:10])
+            logger.info(
+                "✅ Published %d channel updates: %s%s",
+                len(published),
+                preview,
+                "..." if len(published) > 10 else "",
+            )
+        return published + fixture_offsets if fixture_offsets else published
 
-        if published_count > 0:
-            logger.info(f"✅ Published {published_count} channel updates: {', '.join(publications[:10])}{'...' if len(publications) > 10 else ''}")
-        else:
-            logger.debug("🔄 No channels needed publishing (throttle/change-only active)")
+    def _drain_pipeline(self):
+        """Publish stage: send everything pending in the coalescing buffer."""
+        if not self.client.is_connected():
+            # Keep coalescing while the broker is away; only the newest values survive
+            return
+        pending, since = self.pipeline.drain()
+        for universe, values in pending.items():
+            self._publish_offsets(self.routes[universe], sorted(values), values, since[universe])
+
+    def _publisher_thread(self):
+        """Thread draining the coalescing buffer at ``publish_rate_hz``."""
+        interval = 1.0 / self.publish_rate_hz
+        while not self.stop_event.wait(interval):
+            try:
+                self._drain_pipeline()
+            except Exception as e:
+                logger.error("Error in publisher stage: %s", e)
+
+    def _publish_channels(self, route, offsets, values):
+        """Publish one message per changed channel; returns the offsets sent."""
+        topics = route.topics
+        publish = self.client.publish if self.topic_aliases is None else self._publish_aliased
+        published = []
+        for i in offsets:
+            try:
+                # QoS 0 and no retain for high volume
+                publish(topics[i], str(values[i]), qos=0, retain=False)
+                published.append(i)
+            except Exception as e:
+                logger.error("Error publishing channel %s: %s", i + 1, e)
+        self.metrics.publishes += len(published)
+        return published
 
-        # Periodic logging of current values even if not published
-        if hasattr(self, '_last_debug_log'):
-            if time.time() - self._last_debug_log > 10:  # Every 10 seconds
-                current_values = []
-                for i in range(min(self.total_channels, 10)):
-                    channel = self.start_channel + i
-                    dmx_index = channel - 1
-                    if dmx_index < len(dmx_data):
-                        value = int(dmx_data[dmx_index])
-                        current_values.append(f"CH{channel}={value}")
-                logger.info(f"📊 Current values: {', '.join(current_values)}")
-                self._last_debug_log = time.time()
-        else:
-            self._last_debug_log = time.time()
+    def _publish_frame(self, route, offsets, values):
+        """Publish all changed channels of a frame as one JSON object keyed by channel."""
+        payload = "{" + ",".join(f'"{i + 1}":{values[i]}' for i in offsets) + "}"
+        try:
+            publish = self.client.publish if self.topic_aliases is None else self._publish_aliased
+            publish(route.frame_topic, payload, qos=0, retain=False)
+        except Exception as e:
+            logger.error("Error publishing frame for universe %s: %s", route.universe, e)
+            return []
+        self.metrics.publishes += 1
+        return offsets
+
+    def _publish_fixtures(self, route, offsets, values):
+        """Publish one combined state per fixture touched by ``offsets``; returns the offsets sent."""
+        fixture_at = route.fixture_at
+        touched = {}
+        for i in offsets:
+            fixture = fixture_at.get(i)
+            if fixture is not None:
+                touched.setdefault(fixture, []).append(i)
+        if not touched:
+            return []
+
+        published = route.published
+        publish = self.client.publish if self.topic_aliases is None else self._publish_aliased
+        sent = []
+        for fixture, changed in touched.items():
+            # Channels that did not change keep their last published value
+            start = fixture.offset
+            raw = bytearray(published[start:start + len(fixture.roles)])
+            for i in changed:
+                raw[i - start] = values[i]
+            try:
+                publish(fixture.topic, json.dumps(fixture.decode(raw), separators=(",", ":")), qos=0, retain=False)
+            except Exception as e:
+                logger.error("Error publishing fixture %s: %s", fixture.name, e)
+                continue
+            sent.extend(changed)
+            self.metrics.publishes += 1
+            logger.debug("💡 Fixture %s updated (%d channel(s) changed)", fixture.name, len(changed))
+        return sent
 
     def _artnet_listener_thread(self):
-        """Thread to handle ArtNet listening."""
+        """Thread to handle ArtNet (and sACN) listening."""
         logger.info("Starting ArtNet listener thread...")
-        packet_count = 0
-        universe_packets: defaultdict = defaultdict(int)
+        listeners = self._listeners
+        read_packet = listeners[0].readPacket
+        dispatch = self._dispatch_artnet_packet
+        wheel = self.throttle_wheel
+        artsync = self.artsync
+        idle_timeout = 0.05
+        flush_timeout = wheel.tick_ms / 1000
+        socks = {listener.sock: listener.readPacket for listener in listeners}
         try:
             while not self.stop_event.is_set():
-                pkt = self.artnet.readPacket(timeout=0.05)
-                if pkt is None:
-                    continue
-
-                pkt_universe = pkt.universe
-                universe_packets[pkt_universe] += 1
-                logger.debug("Received packet from universe %s", pkt_universe)
-
-                if pkt_universe != self.universe:
-                    continue
-
-                packet_count += 1
-                self._process_artnet_packet(pkt)
-
-                if packet_count % 50 == 0:
-                    logger.info(
-                        "📊 Processed %d packets. Universe stats: %s",
-                        packet_count,
-                        dict(universe_packets),
-                    )
+                timeout = flush_timeout if wheel.size else idle_timeout
+                if len(socks) == 1:
+                    pkt = read_packet(timeout)
+                    if pkt is not None:
+                        dispatch(pkt)
+                else:
+                    # Art-Net and sACN: wait on both sockets, read the ready ones without blocking
+                    ready, _, _ = select.select(list(socks), [], [], timeout)
+                    for sock in ready:
+                        pkt = socks[sock](0)
+                        if pkt is not None:
+                            dispatch(pkt)
+                if wheel.size:
+                    self._flush_throttled()
+                if artsync.active_until and time.monotonic() >= artsync.active_until:
+                    self._expire_artsync()  # the console went silent before its ArtSync
 
         except Exception as e:
             logger.error("Error in ArtNet listener: %s", e)
         finally:
             logger.info(
                 "ArtNet listener stopped. Total: %d, Universes: %s",
-                packet_count,
-                dict(universe_packets),
+                self.metrics.routed,
+                dict(self.metrics.received),
             )
 
-    def _process_artnet_packet(self, packet):
-        """Process received ArtNet packet into a SimpleFrame and dispatch."""
-        try:
-            if not packet:
-                return
+    def _dispatch_artnet_packet(self, pkt):
+        """Count a parsed packet and process it when its universe is routed."""
+        if pkt.opcode == _OPCODE_SYNC:
+            self._on_artsync(pkt)
+            return
 
-            data_array = None
-            universe = self.universe  # default
-
-            # Common extraction attempts (ArtnetPacket usually has data/universe)
-            if hasattr(packet, "data"):
-                data_array = packet.data
-                logger.debug(f"Extracted data from packet.data: {len(data_array) if data_array else 0} bytes")
-            if hasattr(packet, "universe"):
-                universe = packet.universe
-                logger.debug(f"Extracted universe: {universe}")
-
-            # Alternatives
-            if data_array is None and hasattr(packet, "dmx_data"):
-                data_array = packet.dmx_data
-                logger.debug(f"Extracted data from packet.dmx_data: {len(data_array) if data_array else 0} bytes")
-            if data_array is None and hasattr(packet, "payload"):
-                data_array = packet.payload
-                logger.debug(f"Extracted data from packet.payload: {len(data_array) if data_array else 0} bytes")
-
-            # Fallback using converter if available
-            if data_array is None and hasattr(self.artnet, "artnet_packet_to_array"):
-                try:
-                    data_array = self.artnet.artnet_packet_to_array(packet)
-                    logger.debug(f"Converted with artnet_packet_to_array: {len(data_array) if data_array else 0} bytes")
-                except Exception as e:
-                    logger.debug(f"Failed to convert with artnet_packet_to_array: {e}")
+        metrics = self.metrics
+        pkt_universe = pkt.universe
+        metrics.received[pkt_universe] += 1
+
+        if pkt_universe not in self.routes:
+            metrics.filtered[pkt_universe] += 1
+            return
+
+        # Drop duplicate / out-of-order frames before any channel work
+        if pkt.sequence and not self.sequence_tracker.accept(pkt.source, pkt_universe, pkt.sequence):
+            return
 
-            if not data_array:
-                logger.warning("❌ No data found in packet; cannot process.")
-                logger.debug(f"Packet attributes: {[attr for attr in dir(packet) if not attr.startswith('_')]}")
+        if self.merge_mode == "htp":
+            merger = self.mergers.get(pkt_universe)
+            if merger is None:
+                merger = self.mergers[pkt_universe] = _HtpMerger()
+            pkt.data = merger.merge(pkt.source, pkt.data, pkt.received_at)
+
+        metrics.routed += 1
+        artsync = self.artsync
+        if artsync.active_until:
+            if pkt.received_at < artsync.active_until:
+                artsync.hold(pkt)  # published on the next ArtSync
                 return
+            self._expire_artsync()
+        self._process_artnet_packet(pkt)
 
-            # Ignore packets from different universes than configured
-            if universe != self.universe:
-                logger.debug(f"🔄 Ignoring packet from universe {universe} (configured: {self.universe})")
+        if metrics.routed % 50 == 0 and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "📊 Processed %d packets. Universe stats: %s",
+                metrics.routed,
+                dict(metrics.received),
+            )
+
+    def _on_artsync(self, pkt):
+        """Publish every universe held since the previous ArtSync."""
+        if not self.artsync_enabled:
+            return
+        if not self.artsync.active_until:
+            logger.info("⏱️ ArtSync received from %s; publishing universes synchronously", pkt.source)
+            if self._wake_artsync is not None:
+                self._wake_artsync()
+        for frame in self.artsync.sync(pkt.received_at):
+            self._process_artnet_packet(frame)
+
+    def _expire_artsync(self):
+        """No ArtSync for ``timeout_s``: publish what is still held and go back to immediate mode."""
+        logger.info("⏱️ No ArtSync for %.0f s; back to immediate publishing", self.artsync.timeout_s)
+        for frame in self.artsync.expire():
+            self._process_artnet_packet(frame)
+
+    def _process_artnet_packet(self, packet):
+        """Dispatch a received ArtDMX packet (``.universe`` + ``.data``) to the frame handler."""
+        try:
+            if not packet.data:
+                logger.debug("❌ Empty ArtDMX packet for universe %s; ignoring.", packet.universe)
                 return
 
-            class SimpleFrame:
-                def __init__(self, universe, data):
-                    self.universe = universe
-                    self.data = data
+            if logger.isEnabledFor(logging.DEBUG):
+                route = self.routes.get(packet.universe)
+                if route is not None:
+                    data = packet.data
+                    preview = ", ".join(
+                        f"CH{ch}={data[ch - 1]}" for ch in route.channels[:10] if ch <= len(data)
+                    )
+                    logger.debug(
+                        "🎯 ArtNet frame - Universe: %s, seq %s, %d channels; monitored (%s): %s",
+                        packet.universe,
+                        packet.sequence,
+                        len(data),
+                        route.describe(),
+                        preview,
+                    )
 
-            frame = SimpleFrame(universe, data_array)
-            
-            # Detailed log of the channels we will monitor
-            channels_preview = []
-            for i in range(min(self.total_channels, 10)):  # Show up to 10 channels
-                dmx_index = (self.start_channel + i) - 1
-                if dmx_index < len(data_array):
-                    value = int(data_array[dmx_index])
-                    channels_preview.append(f"CH{self.start_channel + i}={value}")
-            
-            logger.info(f"🎯 Processing ArtNet frame - Universe: {universe}, Total channels: {len(data_array)}")
-            logger.info(f"📊 Monitored channels ({self.start_channel}-{self.start_channel + self.total_channels - 1}): {', '.join(channels_preview)}{'...' if self.total_channels > 10 else ''}")
-            
-            self._on_artnet_frame(frame)
+            self._on_artnet_frame(packet)
 
         except Exception as e:
             logger.error("Error processing ArtNet packet: %s", e)
             logger.debug("Packet details - Type: %s", type(packet))
 
+    # ---------- Multi-process workers ----------
+
+    @property
+    def _supervising(self) -> bool:
+        return self.workers > 1 and self.worker is None
+
+    def _shards(self) -> list:
+        """Split the routed universes round-robin into at most ``workers`` shards."""
+        shards = [[] for _ in range(self.workers)]
+        for n, universe in enumerate(sorted(self.routes)):
+            shards[n % self.workers].append(universe)
+        return [shard for shard in shards if shard]
+
+    def _start_workers(self):
+        """Create the forwarding socketpairs and spawn one worker process per shard."""
+        self.worker_ends = {}  # universe -> (artnet end, sacn end) on the supervisor side
+        self.worker_sync_ends = []  # every worker's Art-Net end (ArtSync goes to all)
+        for index, shard in enumerate(self._shards()):
+            spec = _WorkerSpec(index, shard)
+            artnet_end = sacn_end = None
+            if self.artnet is not None:
+                artnet_end, spec.artnet_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+                artnet_end.setblocking(False)
+                self.worker_sync_ends.append(artnet_end)
+            if self.sacn is not None:
+                sacn_end, spec.sacn_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+                sacn_end.setblocking(False)
+            reader, spec.conn = _MP.Pipe(duplex=False)
+            for universe in shard:
+                self.worker_ends[universe] = (artnet_end, sacn_end)
+            self._spawn_worker(spec, reader)
+            logger.info("👷 Worker %d owns universes %s", index, ", ".join(str(u) for u in shard))
+
+    def _spawn_worker(self, spec, reader):
+        proc = _MP.Process(
+            target=_worker_main,
+            args=(spec, self.options_path, self.artnet_port),
+            name=f"artnet2mqtt-w{spec.index}",
+            daemon=True,
+        )
+        proc.start()
+        self.worker_procs[spec.index] = (proc, spec, reader, time.monotonic())
+
+    def _dispatch_thread(self):
+        """
+        Supervisor receive loop: forward each datagram to the worker owning its universe.
+
+        Only the header is looked at; parsing, filtering and publishing happen in
+        the workers. Art-Net datagrams are prefixed with the sender address so
+        sequence tracking and HTP merge keep working per source. A worker that
+        falls behind loses datagrams (``worker_dropped``) instead of stalling
+        the others.
+        """
+        logger.info("Dispatching to %d worker process(es)...", len(self.worker_procs))
+        buffer = bytearray(_ArtNetListener._BUFFER_SIZE + 4)
+        view = memoryview(buffer)
+        body = view[4:]
+        metrics = self.metrics
+        ends = self.worker_ends
+        sync_ends = self.worker_sync_ends
+        sources = {}
+        if self.artnet is not None:
+            sources[self.artnet.sock] = (self.artnet, 0)
+        if self.sacn is not None:
+            sources[self.sacn.sock] = (self.sacn, 1)
+        socks = list(sources)
+        while not self.stop_event.is_set():
+            try:
+                ready, _, _ = select.select(socks, [], [], 0.5)
+            except (OSError, ValueError):
+                break  # sockets closed by stop()
+            for sock in ready:
+                listener, slot = sources[sock]
+                try:
+                    nbytes, addr = sock.recvfrom_into(body)
+                except OSError:
+                    continue
+                universe = listener.peek_universe(body, nbytes, addr)
+                if universe is None:
+                    continue
+                if universe == _ALL_WORKERS:
+                    targets = sync_ends
+                else:
+                    pair = ends.get(universe)
+                    if pair is None:
+                        metrics.received[universe] += 1
+                        metrics.filtered[universe] += 1
+                        continue
+                    targets = (pair[slot],)
+                if slot == 0:
+                    buffer[0:4] = socket.inet_aton(addr[0])
+                    payload = view[:nbytes + 4]
+                else:
+                    payload = body[:nbytes]
+                for target in targets:
+                    try:
+                        target.send(payload)
+                    except OSError:
+                        metrics.worker_dropped += 1
+
+    def _worker_monitor_thread(self):
+        """Supervisor: collect worker metrics and restart workers that died."""
+        while not self.stop_event.wait(1.0):
+            for index, (proc, spec, reader, started) in list(self.worker_procs.items()):
+                try:
+                    while reader.poll():
+                        self.worker_snapshots[index] = reader.recv()
+                except (EOFError, OSError):
+                    pass
+                if proc.is_alive() or self.stop_event.is_set():
+                    continue
+                now = time.monotonic()
+                restart = self.worker_restarts.setdefault(index, [0, None])
+                if restart[1] is None:
+                    # Exponential back-off, so a worker failing at startup is not a fork loop
+                    self._retire_worker_metrics(index)
+                    restart[0] = 1 if now - started >= _WORKER_STABLE_S else restart[0] + 1
+                    first, cap = _WORKER_BACKOFF_S
+                    delay = min(first * 2 ** (restart[0] - 1), cap)
+                    restart[1] = now + delay
+                    logger.warning("Worker %d exited (code %s); restarting in %.0f s", index, proc.exitcode, delay)
+                elif now >= restart[1]:
+                    restart[1] = None
+                    self._spawn_worker(spec, reader)
+
+    def _retire_worker_metrics(self, index):
+        """Keep a dead worker's counters so merged totals never go backwards after its restart."""
+        last = self.worker_snapshots.pop(index, None)
+        if last is None:
+            return
+        counters = {key: value for key, value in last.items() if key not in _SNAPSHOT_GAUGES}
+        retired = self.worker_retired.get(index)
+        if retired is not None:
+            counters = _merge_snapshots([retired, counters])
+            for key in _SNAPSHOT_GAUGES:
+                counters.pop(key, None)
+        self.worker_retired[index] = counters
+
+    def _worker_report_thread(self):
+        """Worker: send a metrics snapshot to the supervisor every second."""
+        conn = self.worker.conn
+        while not self.stop_event.wait(1.0):
+            try:
+                conn.send(self._local_snapshot())
+            except (OSError, ValueError):
+                # Supervisor is gone
+                self.stop_event.set()
+                return
+
+    # ---------- asyncio engine ----------
+
+    async def _ip_publisher_task(self):
+        """Coroutine to publish IP address periodically."""
+        last_sent = ""
+        while True:
+            last_sent = self._publish_ip(last_sent)
+            await asyncio.sleep(max(5, self.ip_publish_interval_s))
+
+    async def _metrics_publisher_task(self):
+        """Coroutine to publish runtime metrics for the diagnostic sensors."""
+        prev = self._metrics_snapshot()
+        while True:
+            await asyncio.sleep(self.metrics_interval_s)
+            prev = self._publish_metrics(prev)
+
+    async def _snapshot_task(self):
+        """Coroutine refreshing the retained universe snapshots every ``snapshot_interval_s``."""
+        while True:
+            await asyncio.sleep(self.snapshot_interval_s)
+            try:
+                self._publish_snapshots()
+            except Exception as e:
+                logger.error("Error publishing snapshots: %s", e)
+
+    async def _throttle_task(self):
+        """Coroutine flushing trailing-edge throttle deadlines; sleeps while none are pending."""
+        armed = asyncio.Event()
+        self._wake_throttle = armed.set
+        tick = self.throttle_wheel.tick_ms / 1000
+        try:
+            while True:
+                if not self.throttle_wheel.size:
+                    # Holds queued before this task started are already in the wheel
+                    armed.clear()
+                    await armed.wait()
+                    continue
+                await asyncio.sleep(tick)
+                self._flush_throttled()
+        finally:
+            self._wake_throttle = None
+
+    async def _artsync_task(self):
+        """Coroutine returning to immediate publishing when ArtSync stops; sleeps in immediate mode."""
+        armed = asyncio.Event()
+        self._wake_artsync = armed.set
+        artsync = self.artsync
+        try:
+            while True:
+                if not artsync.active_until:
+                    armed.clear()
+                    await armed.wait()
+                    continue
+                delay = artsync.active_until - time.monotonic()
+                if delay <= 0:
+                    self._expire_artsync()
+                else:
+                    await asyncio.sleep(delay)  # every ArtSync pushes the deadline further
+        finally:
+            self._wake_artsync = None
+
+    async def _discovery_task(self):
+        """Coroutine publishing discovery configs at ``discovery_rate``."""
+        armed = asyncio.Event()
+        self._wake_discovery = armed.set
+        try:
+            while True:
+                armed.clear()
+                try:
+                    delay = self._pump_discovery()
+                except Exception as e:
+                    logger.error("Error publishing discovery: %s", e)
+                    delay = 1.0
+                try:
+                    await asyncio.wait_for(armed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wake_discovery = None
+
+    async def _output_task(self):
+        """Coroutine sending the output universes (see _ArtNetTransmitter)."""
+        armed = asyncio.Event()
+        self._wake_output = armed.set
+        try:
+            while True:
+                armed.clear()
+                try:
+                    await asyncio.wait_for(armed.wait(), self.transmitter.pump(time.monotonic()))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wake_output = None
+
+    async def _publisher_task(self):
+        """Coroutine draining the coalescing buffer at ``publish_rate_hz``."""
+        interval = 1.0 / self.publish_rate_hz
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self._drain_pipeline()
+            except Exception as e:
+                logger.error("Error in publisher stage: %s", e)
+
+    async def _run_asyncio(self):
+        """Run Art-Net reception, MQTT I/O and periodic work on one event loop."""
+        loop = asyncio.get_running_loop()
+        stopping = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        # MQTT
+        adapter = _AsyncioMqttAdapter(loop, self.client)
+        logger.info("Connecting to MQTT...")
+        self.client.connect(self.mqtt_host, self.mqtt_port, keepalive=60)
+        adapter.start()
+
+        # Art-Net / sACN
+        transports = []
+        for listener in self._listeners:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda listener=listener: _ArtNetProtocol(listener, self._dispatch_artnet_packet),
+                sock=listener.sock,
+            )
+            transports.append(transport)
+
+        tasks = []
+        if self.worker is None:
+            tasks.append(loop.create_task(self._ip_publisher_task()))
+            tasks.append(loop.create_task(self._discovery_task()))
+            if self.transmitter is not None:
+                tasks.append(loop.create_task(self._output_task()))
+        else:
+            Thread(target=self._worker_report_thread, daemon=True).start()
+        if self.throttle_ms > 0 or any(route.filters for route in self.routes.values()):
+            tasks.append(loop.create_task(self._throttle_task()))
+        if self.artsync_enabled and self.artnet is not None:
+            tasks.append(loop.create_task(self._artsync_task()))
+        if self.pipeline is not None:
+            tasks.append(loop.create_task(self._publisher_task()))
+        if self.snapshot_interval_s > 0:
+            tasks.append(loop.create_task(self._snapshot_task()))
+        if self.metrics_interval_s > 0 and self.worker is None:
+            tasks.append(loop.create_task(self._metrics_publisher_task()))
+        if self.metrics_port > 0 and self.worker is None:
+            self._start_metrics_server()
+
+        logger.info("Art-Net2MQTT bridge is running (asyncio engine)...")
+        try:
+            await stopping.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            for transport in transports:
+                transport.close()
+            if self.worker is None:
+                self.client.publish(self.availability_topic, "offline", qos=1, retain=True)
+            self.client.disconnect()
+            await adapter.close()
+            logger.info(
+                "ArtNet listener stopped. Total: %d, Universes: %s",
+                self.metrics.routed,
+                dict(self.metrics.received),
+            )
+
     # ---------- Lifecycle ----------
 
     def start(self):
         """Start the ArtNet to MQTT bridge."""
         try:
+            if self.engine == "asyncio" and not self._supervising:
+                asyncio.run(self._run_asyncio())
+                return
+
             # MQTT
             logger.info("Connecting to MQTT...")
             self.client.connect(self.mqtt_host, self.mqtt_port, keepalive=60)
             self.client.loop_start()
 
             # Auxiliary threads
-            Thread(target=self._ip_publisher_thread, daemon=True).start()
-            Thread(target=self._artnet_listener_thread, daemon=True).start()
+            if self.worker is None:
+                Thread(target=self._ip_publisher_thread, daemon=True).start()
+                Thread(target=self._discovery_thread, daemon=True).start()
+                if self.transmitter is not None:
+                    Thread(target=self._output_thread, daemon=True).start()
+            else:
+                Thread(target=self._worker_report_thread, daemon=True).start()
+            if self._supervising:
+                # Workers (any engine) do the DMX work; this process only dispatches
+                signal.signal(signal.SIGTERM, lambda *_: self.stop_event.set())
+                self._start_workers()
+                Thread(target=self._dispatch_thread, daemon=True).start()
+                Thread(target=self._worker_monitor_thread, daemon=True).start()
+            else:
+                Thread(target=self._artnet_listener_thread, daemon=True).start()
+                if self.pipeline is not None:
+                    Thread(target=self._publisher_thread, daemon=True).start()
+                if self.snapshot_interval_s > 0:
+                    Thread(target=self._snapshot_thread, daemon=True).start()
+            if self.metrics_interval_s > 0 and self.worker is None:
+                Thread(target=self._metrics_publisher_thread, daemon=True).start()
+            if self.metrics_port > 0 and self.worker is None:
+                self._start_metrics_server()
 
             logger.info("Art-Net2MQTT bridge is running...")
             while not self.stop_event.is_set():
@@ -538,19 +3449,42 @@ class ArtNet2MQTT:
         """Stop the Art-Net2MQTT bridge."""
         logger.info("Stopping Art-Net2MQTT bridge...")
         self.stop_event.set()
+        self._discovery_wakeup.set()
+        self._output_wakeup.set()
 
+        capture = self.artnet.capture if self.artnet is not None else None
+        if capture is not None:
+            logger.info(
+                "📼 Capture closed: %d frame(s) in %s%s",
+                capture.count,
+                capture.path,
+                f", {capture.dropped} dropped at capture_max_mb" if capture.dropped else "",
+            )
         try:
-            if hasattr(self, "artnet"):
-                # python_artnet public API
-                if hasattr(self.artnet, "close"):
-                    self.artnet.close()
-                logger.info("ArtNet listener closed")
+            for listener in self._listeners:
+                listener.close()
+            logger.info("ArtNet listener closed")
         except Exception as e:
             logger.warning("Error closing ArtNet listener: %s", e)
 
+        if self.transmitter is not None:
+            self.transmitter.close()
+        if self.state is not None:
+            self.state.close()
+
+        for proc, _, _, _ in self.worker_procs.values():
+            proc.terminate()
+        for proc, _, _, _ in self.worker_procs.values():
+            proc.join(timeout=2)
+
+        if getattr(self, "metrics_server", None) is not None:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+
         try:
             if hasattr(self, "client"):
-                self.client.publish(self.availability_topic, "offline", qos=1, retain=True)
+                if self.worker is None:
+                    self.client.publish(self.availability_topic, "offline", qos=1, retain=True)
                 self.client.loop_stop()
                 self.client.disconnect()
                 logger.info("MQTT client disconnected")
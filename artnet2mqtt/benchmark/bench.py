@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark and load generator for the Art-Net2MQTT bridge.
+- Generates synthetic ArtDMX streams (static, fade, noise, multi-universe).
+- Replaces the paho client with an in-process stand-in that records publishes.
+- Measures the frame handler alone and the full UDP path through _ArtNetListener.
+- Prints machine-readable JSON so results can be compared between versions.
+
+Usage:
+    python3 benchmark/bench.py [--scenario fade] [--frames 2000] [--output results.json]
+"""
+import os
+import re
+import sys
+import json
+import time
+import socket
+import struct
+import random
+import logging
+import argparse
+import platform
+import tempfile
+from threading import Thread
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+import main as bridge_main  # noqa: E402
+
+SCENARIOS = ("static", "fade", "noise", "multi")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic ArtDMX generator
+# ---------------------------------------------------------------------------
+def artdmx_packet(universe: int, data: bytes, sequence: int = 0, physical: int = 0) -> bytes:
+    """Build an ArtDMX datagram."""
+    return (
+        bridge_main._ARTNET_ID
+        + struct.pack("<H", bridge_main._OPCODE_DMX)
+        + struct.pack(">H", 14)
+        + bytes((sequence & 0xFF, physical & 0xFF))
+        + struct.pack("<H", universe)
+        + struct.pack(">H", len(data))
+        + data
+    )
+
+
+def generate_frames(scenario: str, frames: int, universes: int, seed: int = 1):
+    """Yield ``(universe, dmx_bytes)`` for a scenario; multi spreads frames over ``universes``."""
+    rng = random.Random(seed)
+    static = bytes(rng.randrange(256) for _ in range(bridge_main.DMX_CHANNELS))
+    for n in range(frames):
+        if scenario == "static":
+            yield 0, static
+        elif scenario == "fade":
+            yield 0, bytes((n % 256,)) * bridge_main.DMX_CHANNELS
+        elif scenario == "noise":
+            yield 0, rng.randbytes(bridge_main.DMX_CHANNELS)
+        elif scenario == "multi":
+            yield n % universes, bytes(((n // universes) % 256,)) * bridge_main.DMX_CHANNELS
+        else:
+            raise ValueError(f"unknown scenario: {scenario}")
+
+
+# ---------------------------------------------------------------------------
+# In-process MQTT stand-in
+# ---------------------------------------------------------------------------
+class InProcessClient:
+    """Records publishes instead of talking to a broker (paho publish signature)."""
+
+    def __init__(self):
+        self.messages = 0
+        self.payload_bytes = 0
+        self.topic_bytes = 0
+        self.backlog = 0
+
+    def publish(self, topic, payload=None, qos=0, retain=False, properties=None):
+        self.messages += 1
+        self.topic_bytes += len(topic)
+        self.payload_bytes += len(payload) if payload else 0
+
+    def is_connected(self):
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Bridge under test
+# ---------------------------------------------------------------------------
+def make_bridge(args, port: int, options: "dict | None" = None):
+    """Create a bridge from a temporary options file, with the in-process client."""
+    if options is None:
+        universes = args.universes if args.scenario == "multi" else 1
+        options = {
+            "log_level": "error",
+            "mqtt": {"host": "localhost", "port": 1883, "protocol": "5" if args.topic_aliases else "3.1.1"},
+            "universes": [
+                {"universe": u, "start_channel": 1, "channels": args.channels} for u in range(universes)
+            ],
+            "throttle_ms": args.throttle_ms,
+            "publish_on_change_only": True,
+            "publish_mode": args.publish_mode,
+            "metrics_interval_s": 0,
+            "warm_start": False,
+        }
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(options, f)
+        path = f.name
+    try:
+        bridge = bridge_main.ArtNet2MQTT(options_path=path, artnet_port=port)
+    finally:
+        os.unlink(path)
+    bridge.client = InProcessClient()
+    if bridge.topic_aliases is not None:
+        # No CONNACK in-process: grant the aliases a broker would
+        bridge.topic_aliases.reset(getattr(args, "topic_aliases", 0))
+    return bridge
+
+
+def drain_throttle(bridge):
+    """Flush the trailing-edge publishes still held by the throttle, as the listener thread would."""
+    wheel = bridge.throttle_wheel
+    while wheel.size:
+        time.sleep(wheel.tick_ms / 1000)
+        bridge._flush_throttled()
+
+
+class _Frame:
+    __slots__ = ("universe", "data", "received_at")
+
+    def __init__(self, universe, data):
+        self.universe = universe
+        self.data = data
+        self.received_at = 0.0
+
+
+def bench_frame_handler(args) -> dict:
+    """Feed frames straight into ArtNet2MQTT._on_artnet_frame (no sockets)."""
+    bridge = make_bridge(args, port=0)
+    try:
+        frames = [_Frame(u, d) for u, d in generate_frames(args.scenario, args.frames, args.universes)]
+        wheel = bridge.throttle_wheel
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        for frame in frames:
+            frame.received_at = time.monotonic()
+            bridge._on_artnet_frame(frame)
+            if wheel.size:
+                bridge._flush_throttled()
+        drain_throttle(bridge)
+        cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+        return _result("frame_handler", args, bridge, len(frames), len(frames), cpu, wall)
+    finally:
+        bridge.artnet.close()
+
+
+def bench_udp(args) -> dict:
+    """Send ArtDMX to localhost and receive it through _ArtNetListener."""
+    bridge = make_bridge(args, port=args.port)
+    packets = [artdmx_packet(u, d, n) for n, (u, d) in enumerate(generate_frames(args.scenario, args.frames, args.universes))]
+    interval = 1.0 / args.fps if args.fps > 0 else 0.0
+
+    def sender():
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            next_at = time.perf_counter()
+            for pkt in packets:
+                sock.sendto(pkt, ("127.0.0.1", args.port))
+                if interval:
+                    next_at += interval
+                    delay = next_at - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+
+    read_packet = bridge.artnet.readPacket
+    dispatch = bridge._dispatch_artnet_packet
+    wheel = bridge.throttle_wheel
+    received = 0
+    try:
+        thread = Thread(target=sender, daemon=True)
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        thread.start()
+        while received < len(packets):
+            pkt = read_packet(wheel.tick_ms / 1000 if wheel.size else 0.2)
+            if pkt is not None:
+                dispatch(pkt)
+                received += 1
+            if wheel.size:
+                bridge._flush_throttled()
+            if pkt is None and not thread.is_alive():
+                break  # remaining datagrams were dropped by the kernel
+        drain_throttle(bridge)
+        cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+        return _result("udp", args, bridge, len(packets), received, cpu, wall)
+    finally:
+        bridge.artnet.close()
+
+
+def _result(path, args, bridge, sent, received, cpu, wall) -> dict:
+    client = bridge.client
+    latency = bridge.metrics.latency_ms
+    return {
+        "path": path,
+        "scenario": args.scenario,
+        "publish_mode": args.publish_mode,
+        "throttle_ms": args.throttle_ms,
+        "channels": args.channels,
+        "universes": args.universes if args.scenario == "multi" else 1,
+        "frames_sent": sent,
+        "frames_received": received,
+        "drop_ratio": round(1 - received / sent, 4) if sent else 0.0,
+        "wall_s": round(wall, 4),
+        "packets_per_s": round(received / wall, 1) if wall else 0.0,
+        "publishes": client.messages,
+        "publishes_per_s": round(client.messages / wall, 1) if wall else 0.0,
+        "mqtt_bytes": client.topic_bytes + client.payload_bytes,
+        "topic_aliases": args.topic_aliases,
+        "alias_bytes_saved": (
+            bridge.topic_aliases.bytes_saved - bridge.topic_aliases.registration_bytes if bridge.topic_aliases else 0
+        ),
+        "cpu_us_per_frame": round(cpu / received * 1e6, 2) if received else 0.0,
+        "latency_mean_ms": round(latency.total / latency.count, 4) if latency.count else 0.0,
+        "latency_p50_ms": latency.quantile(0.5),
+        "latency_p95_ms": latency.quantile(0.95),
+    }
+
+
+def _addon_version() -> str:
+    path = os.path.join(APP_DIR, "..", "config.yaml")
+    try:
+        with open(path, "r") as f:
+            match = re.search(r'^version:\s*"?([^"\n]+)"?', f.read(), re.M)
+        return match.group(1) if match else "unknown"
+    except OSError:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all")
+    parser.add_argument("--path", choices=("frame_handler", "udp", "all"), default="all")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--universes", type=int, default=8, help="universes for the multi scenario")
+    parser.add_argument("--channels", type=int, default=512)
+    parser.add_argument("--fps", type=float, default=0, help="send rate for the udp path (0 = as fast as possible)")
+    parser.add_argument("--throttle-ms", type=int, default=0)
+    parser.add_argument("--publish-mode", choices=("channel", "frame"), default="channel")
+    parser.add_argument("--topic-aliases", type=int, default=0, help="MQTT v5 topic aliases granted (0 = MQTT 3.1.1)")
+    parser.add_argument("--port", type=int, default=16454, help="UDP port for the udp path")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    paths = ("frame_handler", "udp") if args.path == "all" else (args.path,)
+
+    results = []
+    for scenario in scenarios:
+        args.scenario = scenario
+        for path in paths:
+            results.append(bench_frame_handler(args) if path == "frame_handler" else bench_udp(args))
+
+    report = {
+        "addon_version": _addon_version(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": int(time.time()),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+"""
+Replay a capture recorded by the Art-Net2MQTT bridge (capture_file option).
+- Sends the recorded ArtDMX/ArtSync packets to a UDP port (a running add-on or node),
+  or feeds them into an in-process ArtNet2MQTT with the benchmark's MQTT stand-in.
+- Keeps the recorded timing at --speed 1, runs N times faster at --speed N,
+  and replays as fast as possible at --speed 0.
+- Prints machine-readable JSON, so a capture doubles as a repeatable benchmark.
+
+Usage:
+    python3 benchmark/replay.py show.a2m --target udp --host 192.168.1.50 [--speed 2]
+    python3 benchmark/replay.py show.a2m --target bridge --options options.json --speed 0
+"""
+import json
+import time
+import socket
+import struct
+import logging
+import argparse
+
+import bench
+from bench import bridge_main, artdmx_packet, make_bridge, drain_throttle
+
+
+def artsync_packet() -> bytes:
+    """Build an ArtSync datagram."""
+    return bridge_main._ARTNET_ID + struct.pack("<H", bridge_main._OPCODE_SYNC) + struct.pack(">H", 14) + bytes(2)
+
+
+def paced(reader, speed: float):
+    """Yield capture records, sleeping so they follow the recorded timing divided by ``speed``."""
+    start = time.perf_counter()
+    for record in reader:
+        if speed > 0:
+            delay = start + record[0] / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        yield record
+
+
+def replay_udp(reader, args) -> dict:
+    """Send the capture as Art-Net datagrams to ``--host:--port``."""
+    sync = artsync_packet()
+    sent = 0
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        target = (args.host, args.port)
+        wall0 = time.perf_counter()
+        for _, universe, sequence, physical, _, data in paced(reader, args.speed):
+            if universe == bridge_main._CAPTURE_SYNC:
+                sock.sendto(sync, target)
+            else:
+                sock.sendto(artdmx_packet(universe, data, sequence, physical), target)
+            sent += 1
+        wall = time.perf_counter() - wall0
+    return {
+        "target": "udp",
+        "destination": f"{args.host}:{args.port}",
+        "packets_sent": sent,
+        "wall_s": round(wall, 4),
+        "packets_per_s": round(sent / wall, 1) if wall else 0.0,
+    }
+
+
+def _bridge_options(reader, args) -> dict:
+    """The add-on options to replay against: ``--options`` or every captured universe in full."""
+    if args.options:
+        with open(args.options, "r") as f:
+            options = json.load(f)
+    else:
+        universes = sorted({record[1] for record in reader} - {bridge_main._CAPTURE_SYNC})
+        options = {
+            "universes": [{"universe": u, "start_channel": 1, "channels": 512} for u in universes],
+            "throttle_ms": 0,
+        }
+    # In-process: one Art-Net listener, no broker, no side tasks
+    options.update(
+        log_level="error",
+        mqtt={"host": "localhost", "port": 1883},
+        metrics_interval_s=0,
+        metrics_port=0,
+        input_protocol="artnet",
+        workers=1,
+        capture_file="",
+        warm_start=False,
+    )
+    return options
+
+
+def replay_bridge(reader, args) -> dict:
+    """Dispatch the capture through ArtNet2MQTT in-process, as the listener would."""
+    bridge = make_bridge(args, port=0, options=_bridge_options(reader, args))
+    packet = bridge_main._ArtNetPacket()
+    dispatch = bridge._dispatch_artnet_packet
+    wheel = bridge.throttle_wheel
+    dispatched = 0
+    try:
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        for _, universe, sequence, physical, source, data in paced(reader, args.speed):
+            if universe == bridge_main._CAPTURE_SYNC:
+                packet.opcode = bridge_main._OPCODE_SYNC
+                packet.data = b""
+            else:
+                packet.opcode = bridge_main._OPCODE_DMX
+                packet.universe = universe
+                packet.data = data
+                packet.sequence = sequence
+                packet.physical = physical
+            packet.source = source
+            packet.received_at = time.monotonic()
+            dispatch(packet)
+            dispatched += 1
+            if wheel.size:
+                bridge._flush_throttled()
+        drain_throttle(bridge)
+        cpu, wall = time.process_time() - cpu0, time.perf_counter() - wall0
+    finally:
+        bridge.artnet.close()
+
+    client = bridge.client
+    latency = bridge.metrics.latency_ms
+    return {
+        "target": "bridge",
+        "packets": dispatched,
+        "wall_s": round(wall, 4),
+        "packets_per_s": round(dispatched / wall, 1) if wall else 0.0,
+        "publishes": client.messages,
+        "publishes_per_s": round(client.messages / wall, 1) if wall else 0.0,
+        "mqtt_bytes": client.topic_bytes + client.payload_bytes,
+        "cpu_us_per_packet": round(cpu / dispatched * 1e6, 2) if dispatched else 0.0,
+        "latency_p50_ms": latency.quantile(0.5),
+        "latency_p95_ms": latency.quantile(0.95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", help="capture file written by the capture_file option")
+    parser.add_argument("--target", choices=("udp", "bridge"), default="bridge")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = recorded timing, N = N times faster, 0 = max")
+    parser.add_argument("--host", default="127.0.0.1", help="destination for --target udp")
+    parser.add_argument("--port", type=int, default=bridge_main.ARTNET_PORT, help="destination port for --target udp")
+    parser.add_argument("--options", help="add-on options JSON for --target bridge (default: all captured universes)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+    if args.speed < 0:
+        parser.error("--speed must be >= 0")
+
+    logging.getLogger().setLevel(logging.ERROR)
+    reader = bridge_main._CaptureReader(args.capture)
+    try:
+        report = {
+            "addon_version": bench._addon_version(),
+            "capture": args.capture,
+            "capture_started_at": int(reader.started_at),
+            "capture_packets": len(reader),
+            "capture_duration_s": round(reader.duration, 3),
+            "speed": args.speed,
+        }
+        report.update(replay_udp(reader, args) if args.target == "udp" else replay_bridge(reader, args))
+    finally:
+        reader.close()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
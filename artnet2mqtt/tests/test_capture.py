@@ -0,0 +1,68 @@
+"""
+Capture files: what ``_CaptureWriter`` records, ``_CaptureReader`` reads back.
+
+Run from the add-on directory:
+    python3 -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import main as bridge_main  # noqa: E402
+
+
+class CaptureRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".cap")
+        os.close(fd)
+        self.addCleanup(os.unlink, self.path)
+
+    def _read(self):
+        reader = bridge_main._CaptureReader(self.path)
+        self.addCleanup(reader.close)
+        return [(universe, sequence, physical, source, bytes(data)) for _, universe, sequence, physical, source, data in reader]
+
+    def test_dmx_and_sync_records_round_trip(self):
+        writer = bridge_main._CaptureWriter(self.path, 1024 * 1024)
+        packet = bridge_main._ArtNetPacket(3, bytes(range(8)), sequence=42, physical=1)
+        writer.append(packet, ("192.168.1.20", 6454))
+        # The listener reuses the packet for ArtSync; the record must not carry the DMX fields
+        packet.opcode = bridge_main._OPCODE_SYNC
+        writer.append(packet, ("192.168.1.20", 6454))
+        writer.append(bridge_main._ArtNetPacket(4, b"\xff" * 600, sequence=43), ("10.0.0.2", 6454))
+        writer.close()
+        self.assertEqual(self._read(), [
+            (3, 42, 1, "192.168.1.20", bytes(range(8))),
+            (bridge_main._CAPTURE_SYNC, 0, 0, "192.168.1.20", b""),
+            (4, 43, 0, "10.0.0.2", b"\xff" * bridge_main.DMX_CHANNELS),
+        ])
+
+    def test_size_limit_counts_dropped_frames(self):
+        size = bridge_main._CAPTURE_HEADER.size + 2 * bridge_main._CAPTURE_RECORD_SIZE
+        writer = bridge_main._CaptureWriter(self.path, size)
+        for n in range(5):
+            writer.append(bridge_main._ArtNetPacket(0, bytes((n,))))
+        writer.close()
+        self.assertEqual((writer.count, writer.dropped), (2, 3))
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertEqual([data for *_, data in self._read()], [b"\x00", b"\x01"])
+
+    def test_append_after_close_is_ignored(self):
+        writer = bridge_main._CaptureWriter(self.path, 1024 * 1024)
+        writer.close()
+        writer.append(bridge_main._ArtNetPacket(0, b"\x01"))
+        writer.close()
+        self.assertEqual(self._read(), [])
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a capture" * 10)
+        with self.assertRaises(ValueError):
+            bridge_main._CaptureReader(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
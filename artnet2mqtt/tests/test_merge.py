@@ -0,0 +1,76 @@
+"""
+ArtDMX sequence tracking and HTP merging of several sources.
+
+Run from the add-on directory:
+    python3 -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import main as bridge_main  # noqa: E402
+
+
+class SequenceTrackerTest(unittest.TestCase):
+    def setUp(self):
+        self.tracker = bridge_main._SequenceTracker(resync_after=3)
+
+    def test_in_order_frames_pass_and_wrap(self):
+        self.assertTrue(all(self.tracker.accept("10.0.0.1", 0, seq) for seq in (253, 254, 255, 1, 2)))
+        self.assertEqual(self.tracker.rejected, 0)
+
+    def test_duplicates_and_late_frames_are_rejected(self):
+        self.tracker.accept("10.0.0.1", 0, 10)
+        self.assertFalse(self.tracker.accept("10.0.0.1", 0, 10))
+        self.assertFalse(self.tracker.accept("10.0.0.1", 0, 9))
+        self.assertTrue(self.tracker.accept("10.0.0.1", 0, 11))
+        self.assertEqual(self.tracker.rejected, 2)
+
+    def test_zero_disables_tracking(self):
+        self.tracker.accept("10.0.0.1", 0, 10)
+        self.assertTrue(self.tracker.accept("10.0.0.1", 0, 0))
+        self.assertTrue(self.tracker.accept("10.0.0.1", 0, 0))
+
+    def test_sources_and_universes_are_independent(self):
+        self.tracker.accept("10.0.0.1", 0, 10)
+        self.assertTrue(self.tracker.accept("10.0.0.2", 0, 5))
+        self.assertTrue(self.tracker.accept("10.0.0.1", 1, 5))
+
+    def test_resync_after_sender_restart(self):
+        self.tracker.accept("10.0.0.1", 0, 100)
+        self.assertFalse(self.tracker.accept("10.0.0.1", 0, 40))
+        self.assertFalse(self.tracker.accept("10.0.0.1", 0, 41))
+        self.assertTrue(self.tracker.accept("10.0.0.1", 0, 42))  # third stale frame in a row
+        self.assertTrue(self.tracker.accept("10.0.0.1", 0, 43))
+
+
+class HtpMergerTest(unittest.TestCase):
+    def setUp(self):
+        self.merger = bridge_main._HtpMerger(timeout_s=10.0)
+
+    def test_single_source_passes_through(self):
+        data = bytes((1, 2, 3))
+        self.assertIs(self.merger.merge("a", data, 0.0), data)
+
+    def test_highest_value_per_channel(self):
+        self.merger.merge("a", bytes((10, 0, 30)), 0.0)
+        self.assertEqual(self.merger.merge("b", bytes((5, 20, 40, 7)), 1.0), bytes((10, 20, 40, 7)))
+        # Each source's newest frame counts, not the highest it ever sent
+        self.assertEqual(self.merger.merge("a", bytes((0, 0, 0)), 2.0), bytes((5, 20, 40, 7)))
+
+    def test_shorter_frame_clears_the_tail(self):
+        self.merger.merge("a", bytes((10, 10, 10)), 0.0)
+        self.merger.merge("b", bytes((1,)), 0.0)
+        self.assertEqual(self.merger.merge("a", bytes((2,)), 1.0), bytes((2,)))
+
+    def test_silent_source_leaves_the_merge(self):
+        self.merger.merge("a", bytes((255,)), 0.0)
+        self.merger.merge("b", bytes((10,)), 5.0)
+        data = bytes((20,))
+        self.assertIs(self.merger.merge("b", data, 10.5), data)  # "a" silent for more than 10 s
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Warm start: ``_StateFile`` carries the last published frames across a restart.
+
+Run from the add-on directory:
+    python3 -m unittest discover tests
+"""
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import main as bridge_main  # noqa: E402
+
+from test_throttle import _Frame, _RecordingClient  # noqa: E402
+
+
+class StateFileTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "dmx_state.bin")
+
+    def _open(self, fingerprint, universes=(0,)):
+        state = bridge_main._StateFile(self.path, fingerprint, universes)
+        self.addCleanup(state.close)
+        return state
+
+    def test_reopen_restores_frames(self):
+        state = self._open(b"A" * 8, (0, 1))
+        state._mmap[state._offsets[1] + 3] = 0xFF  # channel 4 of universe 1 seen...
+        state._mmap[state._offsets[1] + bridge_main.DMX_CHANNELS + 3] = 42  # ...and published as 42
+        state.close()
+        state = self._open(b"A" * 8, (1, 2))
+        seen, published = state.restored[1]
+        self.assertEqual((seen[3], published[3]), (0xFF, 42))
+        # Routed universes resume from the restored frame, new ones start empty
+        start = state._offsets[1]
+        self.assertEqual(state._mmap[start + 3], 0xFF)
+        self.assertEqual(state._mmap[state._offsets[2]:state._offsets[2] + bridge_main.DMX_CHANNELS], bytes(512))
+
+    def test_fingerprint_mismatch_starts_cold(self):
+        state = self._open(b"A" * 8)
+        state._mmap[state._offsets[0]] = 0xFF
+        state.close()
+        self.assertEqual(self._open(b"B" * 8).restored, {})
+
+    def test_foreign_file_starts_cold(self):
+        with open(self.path, "wb") as f:
+            f.write(b"\x00" * 100)
+        self.assertEqual(self._open(b"A" * 8).restored, {})
+
+
+class WarmStartBridgeTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.options_path = os.path.join(tmp.name, "options.json")
+
+    def _bridge(self, node_name="artnet_bridge"):
+        options = {
+            "log_level": "error",
+            "node_name": node_name,
+            "mqtt": {"host": "localhost", "port": 1883},
+            "universes": [{"universe": 0, "start_channel": 1, "channels": 4}],
+            "throttle_ms": 0,
+            "publish_on_change_only": True,
+            "metrics_interval_s": 0,
+            "warm_start": True,
+        }
+        with open(self.options_path, "w") as f:
+            json.dump(options, f)
+        bridge = bridge_main.ArtNet2MQTT(options_path=self.options_path, artnet_port=0)
+        self.addCleanup(bridge.artnet.close)
+        bridge.client = _RecordingClient()
+        return bridge
+
+    def _send(self, bridge, data):
+        bridge._on_artnet_frame(_Frame(0, bytes(data)))
+        published, bridge.client.published = bridge.client.published, []
+        return [topic for topic, _ in published]
+
+    def test_restart_only_publishes_changes(self):
+        bridge = self._bridge()
+        self.assertEqual(len(self._send(bridge, (1, 2, 3, 4))), 4)
+        bridge.state.close()
+
+        bridge = self._bridge()
+        self.assertEqual(self._send(bridge, (1, 2, 3, 4)), [])
+        self.assertEqual(self._send(bridge, (1, 2, 3, 9)), ["artnet_bridge/u/0/ch/4"])
+
+    def test_new_node_name_starts_cold(self):
+        bridge = self._bridge()
+        self._send(bridge, (1, 2, 3, 4))
+        bridge.state.close()
+
+        bridge = self._bridge("other_bridge")
+        self.assertEqual(len(self._send(bridge, (1, 2, 3, 4))), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Trailing-edge throttle: a value held back by ``throttle_ms`` is never lost.
+
+Run from the add-on directory:
+    python3 -m unittest discover tests
+"""
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import main as bridge_main  # noqa: E402
+
+
+class _RecordingClient:
+    """Records publishes instead of talking to a broker (paho publish signature)."""
+
+    def __init__(self):
+        self.published = []
+
+    def publish(self, topic, payload=None, qos=0, retain=False, properties=None):
+        self.published.append((topic, payload))
+
+    def is_connected(self):
+        return True
+
+
+class _Frame:
+    def __init__(self, universe, data):
+        self.universe = universe
+        self.data = data
+        self.received_at = 0.0
+
+
+class TrailingEdgeThrottleTest(unittest.TestCase):
+    def setUp(self):
+        options = {
+            "log_level": "error",
+            "mqtt": {"host": "localhost", "port": 1883},
+            "universes": [{"universe": 0, "start_channel": 1, "channels": 1}],
+            "throttle_ms": 100,
+            "publish_on_change_only": True,
+            "metrics_interval_s": 0,
+            "warm_start": False,
+        }
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(options, f)
+            path = f.name
+        try:
+            self.bridge = bridge_main.ArtNet2MQTT(options_path=path, artnet_port=0)
+        finally:
+            os.unlink(path)
+        self.addCleanup(self.bridge.artnet.close)
+        self.bridge.client = _RecordingClient()
+        self.route = self.bridge.routes[0]
+
+    def _at(self, now_ms, value=None):
+        """Deliver a frame carrying ``value`` (or only flush the throttle) at monotonic ``now_ms``."""
+        with mock.patch.object(bridge_main.time, "monotonic", return_value=now_ms / 1000):
+            if value is not None:
+                self.bridge._on_artnet_frame(_Frame(0, bytes((value,))))
+            self.bridge._flush_throttled()
+
+    def test_value_held_after_leading_edge_publish_is_flushed(self):
+        self._at(1003, 10)  # published
+        self._at(1050, 20)  # held until 1103
+        self._at(1103.5, 30)  # window open again: published on the leading edge
+        self._at(1104, 40)  # held, channel still scheduled from t=1050
+        self._at(1105)  # the t=1050 deadline fires; 40 must stay held
+        self.assertEqual(self.route.published[0], 30)
+        self._at(1210)
+        self.assertEqual(self.route.published[0], 40)
+        self.assertEqual([payload for _, payload in self.bridge.client.published][-1], "40")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+MQTT v5 topic aliases: filling the table, registration, rebalancing and reset.
+
+Run from the add-on directory:
+    python3 -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import main as bridge_main  # noqa: E402
+
+
+class TopicAliasesTest(unittest.TestCase):
+    def setUp(self):
+        self.aliases = bridge_main._TopicAliases()
+
+    def test_no_aliases_before_connack(self):
+        self.assertEqual(self.aliases.resolve("a/ch/1"), ("a/ch/1", None))
+
+    def test_table_fills_on_first_publish(self):
+        self.aliases.reset(10)
+        for n in range(100):
+            self.aliases.resolve(f"a/ch/{n % 10}")
+        self.assertEqual(len(self.aliases._assigned), 10)
+        self.assertEqual(self.aliases.hits, 90)
+
+    def test_first_publish_registers_then_topic_is_empty(self):
+        self.aliases.reset(1)
+        topic, first = self.aliases.resolve("a/ch/1")
+        self.assertEqual(topic, "a/ch/1")
+        self.assertEqual(first.TopicAlias, 1)
+        topic, again = self.aliases.resolve("a/ch/1")
+        self.assertEqual(topic, "")
+        self.assertIs(again, first)
+        self.assertEqual(self.aliases.resolve("a/ch/2"), ("a/ch/2", None))  # table full
+
+    def test_packed_properties_match_paho(self):
+        properties = bridge_main.Properties(bridge_main.PacketTypes.PUBLISH)
+        properties.TopicAlias = 7
+        self.assertEqual(bridge_main._AliasProperties(7).pack(), properties.pack())
+
+    def test_rebalance_evicts_cold_topics(self):
+        self.aliases.reset(1)
+        self.aliases.resolve("cold")
+        for _ in range(self.aliases._REBALANCE_EVERY - 2):
+            self.aliases.resolve("hot")
+        self.assertEqual(list(self.aliases._assigned), ["cold"])
+        # The rebalancing publish hands the alias over and registers it with the full topic
+        self.assertEqual(self.aliases.resolve("hot"), ("hot", self.aliases._properties[1]))
+        self.assertEqual(list(self.aliases._assigned), ["hot"])
+
+    def test_reset_drops_aliases(self):
+        self.aliases.reset(2)
+        self.aliases.resolve("a")
+        self.aliases.resolve("a")
+        self.aliases.reset(0)
+        self.assertEqual(self.aliases.resolve("a"), ("a", None))
+        self.aliases.reset(2)
+        self.assertEqual(self.aliases.resolve("a")[0], "a")  # registered again on the new connection
+
+    def test_byte_counters_only_grow(self):
+        self.aliases.reset(1)
+        seen = []
+        for _ in range(3):
+            self.aliases.reset(1)  # reconnect: every alias is registered again
+            for _ in range(3):
+                self.aliases.resolve("abcdef")
+                seen.append((self.aliases.bytes_saved, self.aliases.registration_bytes))
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual(self.aliases.bytes_saved, 6 * (len("abcdef") - 3))
+        self.assertEqual(self.aliases.registration_bytes, 3 * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()